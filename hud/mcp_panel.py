@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # MCP Panel for Hextrix HUD
 
+import io
 import os
 import sys
 import json
@@ -1074,25 +1075,21 @@ class MCPPanel:
                 if "results" in result:
                     results = result["results"]
                     if isinstance(results, list):
-                        result_text = self.command_buffer.get_text(
-                            self.command_buffer.get_start_iter(),
-                            self.command_buffer.get_end_iter(),
-                            False
-                        )
-                        
-                        result_text += "\n\nResults:\n"
+                        # Append to the buffer instead of reading it back
+                        more = io.StringIO()
+                        more.write("\n\nResults:\n")
                         for item in results:
                             if isinstance(item, dict):
                                 title = item.get("title", "")
                                 content = item.get("content", "")
                                 if title:
-                                    result_text += f"\n{title}\n"
+                                    more.write(f"\n{title}\n")
                                 if content:
-                                    result_text += f"{content}\n"
+                                    more.write(f"{content}\n")
                             else:
-                                result_text += f"\n{item}\n"
+                                more.write(f"\n{item}\n")
                         
-                        self.command_buffer.set_text(result_text)
+                        self.command_buffer.insert(self.command_buffer.get_end_iter(), more.getvalue())
             else:
                 self.command_buffer.set_text(str(result))
         else:
@@ -3,62 +3,495 @@
 
 import os
 import sys
+import base64
 import time
 import json
-from urllib.parse import quote
+import struct
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Use the same GTK version as the main application (4.0)
 import gi
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk, GLib, GObject
 
-# Create QApplication at module level to ensure it exists before any QWidgets
+# Only the core Qt modules are needed to define the widget classes. QtWebKit,
+# QtOpenGL, cairo and the QApplication itself are loaded by _ensure_qt() when a
+# visualization is first created, keeping this module cheap to import.
 try:
-    from PyQt5.QtCore import QUrl, Qt, QSize, QTimer
-    from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel
-    from PyQt5.QtWebKitWidgets import QWebView
-    from PyQt5.QtWebKit import QWebSettings
-    from PyQt5.QtGui import QPixmap
-    
-    print("Successfully imported PyQt5 modules")
-    
-    # Initialize QApplication at module level
-    if not QApplication.instance():
-        print("Creating new QApplication instance")
-        qt_app = QApplication(sys.argv)
-    else:
-        print("Using existing QApplication instance")
-        qt_app = QApplication.instance()
-        
-    QTWEBKIT_AVAILABLE = True
-    print("QtWebKit is available")
+    from PyQt5.QtCore import QUrl, Qt, QSize, QTimer, QEventLoop, QObject, QByteArray, pyqtSignal
+    from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QGraphicsScene, QGraphicsView
+    from PyQt5.QtGui import QImage, QPainter
+    
+    QT_AVAILABLE = True
+    QTWEBKIT_AVAILABLE = importlib.util.find_spec('PyQt5.QtWebKitWidgets') is not None
+    if not QTWEBKIT_AVAILABLE:
+        print("QtWebKit is not available. Using fallback visualization.")
 except ImportError as e:
     print(f"Failed to import Qt modules: {e}")
     print("QtWebKit is not available. Using fallback visualization.")
+    QT_AVAILABLE = False
     QTWEBKIT_AVAILABLE = False
-    qt_app = None
 
-try:
-    import cairo
-except ImportError:
-    print("Warning: Cairo not available for Qt/GTK rendering")
-    cairo = None
+# Time budget for each Qt event pump from the GTK frame clock
+QT_EVENT_BUDGET_MS = 4
+
+# Resolved by _ensure_qt()
+qt_app = None
+cairo = None
+QTOPENGL_AVAILABLE = False
+_qt_loaded = False
 
-# Import needed global imports if not already imported
-if 'cairo' not in globals():
+def _ensure_qt():
+    """Import the heavy Qt/cairo modules and create the QApplication on first use"""
+    global qt_app, cairo, QTWEBKIT_AVAILABLE, QTOPENGL_AVAILABLE, _qt_loaded
+    if _qt_loaded:
+        return QTWEBKIT_AVAILABLE
+    _qt_loaded = True
+    
+    if QTWEBKIT_AVAILABLE:
+        try:
+            from PyQt5.QtWebKitWidgets import QWebView, QGraphicsWebView
+            from PyQt5.QtWebKit import QWebSettings
+            globals().update(QWebView=QWebView, QGraphicsWebView=QGraphicsWebView,
+                             QWebSettings=QWebSettings)
+            print("QtWebKit is available")
+        except ImportError as e:
+            print(f"Failed to import QtWebKit: {e}")
+            QTWEBKIT_AVAILABLE = False
+    
+    # OpenGL viewport lets WebKit composite on the GPU instead of the software rasterizer
+    try:
+        from PyQt5.QtOpenGL import QGLWidget, QGLFormat, QGL
+        globals().update(QGLWidget=QGLWidget, QGLFormat=QGLFormat, QGL=QGL)
+        QTOPENGL_AVAILABLE = QTWEBKIT_AVAILABLE
+    except ImportError:
+        print("QtOpenGL not available, using software rendering for visualization")
+        QTOPENGL_AVAILABLE = False
+    
     try:
-        import cairo
+        import cairo as _cairo
+        cairo = _cairo
     except ImportError:
-        print("Failed to import cairo for Qt-GTK bridge")
-        cairo = None
+        print("Warning: Cairo not available for Qt/GTK rendering")
+    
+    # A QApplication must exist before any QWidget is created
+    if QT_AVAILABLE:
+        qt_app = QApplication.instance()
+        if not qt_app:
+            print("Creating new QApplication instance")
+            qt_app = QApplication(sys.argv)
+    
+    return QTWEBKIT_AVAILABLE
+
+# Basic HTML with canvas visualization, used when the asset file is missing
+_INLINE_HTML = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body, html {
+                    margin: 0;
+                    padding: 0;
+                    width: 100%;
+                    height: 100%;
+                    overflow: hidden;
+                    background-color: rgba(0, 0, 0, 0);
+                }
+                canvas {
+                    display: block;
+                    width: 100%;
+                    height: 100%;
+                }
+            </style>
+        </head>
+        <body>
+            <canvas id="canvas"></canvas>
+            <script>
+                const canvas = document.getElementById('canvas');
+                
+                // Prefer instanced WebGL; fall back to Canvas2D when unavailable
+                const gl = canvas.getContext('webgl', { alpha: true, premultipliedAlpha: true });
+                const instancing = gl ? gl.getExtension('ANGLE_instanced_arrays') : null;
+                const useGL = !!(gl && instancing);
+                const ctx = useGL ? null : canvas.getContext('2d');
+                
+                // Set canvas dimensions
+                canvas.width = window.innerWidth;
+                canvas.height = window.innerHeight;
+                
+                // Animation parameters
+                let animationFrame = null;
+                let time = 0;
+                let needsRender = true;
+                let animating = false;
+                let network = null;
+                let values = [];
+                
+                // Node buffers reused across frames
+                const NODE_COUNT = 30;
+                const CORE_LEVELS = 4;
+                const nodeX = new Float32Array(NODE_COUNT);
+                const nodeY = new Float32Array(NODE_COUNT);
+                const nodePulse = new Float32Array(NODE_COUNT);
+                
+                // Pre-render the node glow once instead of a gradient per node per frame
+                const GLOW_RADIUS = 15;
+                let glowSprite = null;
+                if (!useGL) {
+                    glowSprite = document.createElement('canvas');
+                    glowSprite.width = GLOW_RADIUS * 2;
+                    glowSprite.height = GLOW_RADIUS * 2;
+                    const glowCtx = glowSprite.getContext('2d');
+                    const glowGradient = glowCtx.createRadialGradient(
+                        GLOW_RADIUS, GLOW_RADIUS, 0, GLOW_RADIUS, GLOW_RADIUS, GLOW_RADIUS);
+                    glowGradient.addColorStop(0, 'rgba(0, 191, 255, 0.8)');
+                    glowGradient.addColorStop(1, 'rgba(0, 0, 0, 0)');
+                    glowCtx.fillStyle = glowGradient;
+                    glowCtx.fillRect(0, 0, GLOW_RADIUS * 2, GLOW_RADIUS * 2);
+                }
+                
+                // WebGL renderer: one instanced draw for all nodes; position, pulse,
+                // glow and core are computed on the GPU from u_time
+                const VERTEX_SHADER = `
+                    attribute vec2 a_corner;
+                    attribute float a_index;
+                    attribute float a_value;
+                    uniform float u_time;
+                    uniform float u_count;
+                    uniform float u_hasValues;
+                    uniform vec2 u_resolution;
+                    varying vec2 v_offset;
+                    varying float v_pulse;
+                    void main() {
+                        float angle = a_index / u_count * 6.2831853;
+                        float radius = 100.0 + sin(u_time + a_index * 0.2) * 20.0;
+                        float pulse = u_hasValues > 0.5
+                            ? clamp(a_value, 0.0, 1.0)
+                            : sin(u_time + a_index * 0.3) * 0.5 + 0.5;
+                        vec2 center = u_resolution * 0.5 + vec2(cos(angle), sin(angle)) * radius;
+                        vec2 clip = (center + a_corner * 15.0) / u_resolution * 2.0 - 1.0;
+                        gl_Position = vec4(clip.x, -clip.y, 0.0, 1.0);
+                        v_offset = a_corner * 15.0;
+                        v_pulse = pulse;
+                    }`;
+                const FRAGMENT_SHADER = `
+                    precision mediump float;
+                    varying vec2 v_offset;
+                    varying float v_pulse;
+                    void main() {
+                        float r = length(v_offset);
+                        float glowAlpha = 0.8 * v_pulse * max(0.0, 1.0 - r / 15.0);
+                        vec4 glow = vec4(0.0, 0.749, 1.0, 1.0) * glowAlpha;
+                        float coreRadius = 3.0 + v_pulse * 2.0;
+                        float coreAlpha = (0.7 + 0.3 * v_pulse)
+                            * (1.0 - smoothstep(coreRadius - 0.5, coreRadius + 0.5, r));
+                        gl_FragColor = vec4(coreAlpha) + glow * (1.0 - coreAlpha);
+                    }`;
+                
+                let glProgram = null;
+                let glUniforms = null;
+                let valueBuffer = null;
+                const instanceValues = new Float32Array(NODE_COUNT);
+                
+                function compileShader(type, source) {
+                    const shader = gl.createShader(type);
+                    gl.shaderSource(shader, source);
+                    gl.compileShader(shader);
+                    return shader;
+                }
+                
+                function bindAttribute(name, data, size, divisor) {
+                    const buffer = gl.createBuffer();
+                    const location = gl.getAttribLocation(glProgram, name);
+                    gl.bindBuffer(gl.ARRAY_BUFFER, buffer);
+                    gl.bufferData(gl.ARRAY_BUFFER, data, divisor ? gl.DYNAMIC_DRAW : gl.STATIC_DRAW);
+                    gl.enableVertexAttribArray(location);
+                    gl.vertexAttribPointer(location, size, gl.FLOAT, false, 0, 0);
+                    instancing.vertexAttribDivisorANGLE(location, divisor);
+                    return buffer;
+                }
+                
+                function initGL() {
+                    glProgram = gl.createProgram();
+                    gl.attachShader(glProgram, compileShader(gl.VERTEX_SHADER, VERTEX_SHADER));
+                    gl.attachShader(glProgram, compileShader(gl.FRAGMENT_SHADER, FRAGMENT_SHADER));
+                    gl.linkProgram(glProgram);
+                    gl.useProgram(glProgram);
+                    
+                    const indices = new Float32Array(NODE_COUNT);
+                    for (let i = 0; i < NODE_COUNT; i++) {
+                        indices[i] = i;
+                    }
+                    bindAttribute('a_corner', new Float32Array([-1, -1, 1, -1, -1, 1, 1, 1]), 2, 0);
+                    bindAttribute('a_index', indices, 1, 1);
+                    valueBuffer = bindAttribute('a_value', instanceValues, 1, 1);
+                    
+                    glUniforms = {
+                        time: gl.getUniformLocation(glProgram, 'u_time'),
+                        count: gl.getUniformLocation(glProgram, 'u_count'),
+                        hasValues: gl.getUniformLocation(glProgram, 'u_hasValues'),
+                        resolution: gl.getUniformLocation(glProgram, 'u_resolution')
+                    };
+                    gl.uniform1f(glUniforms.count, NODE_COUNT);
+                    gl.uniform1f(glUniforms.hasValues, 0);
+                    gl.enable(gl.BLEND);
+                    gl.blendFunc(gl.ONE, gl.ONE_MINUS_SRC_ALPHA);
+                    gl.clearColor(0, 0, 0, 0);
+                }
+                
+                function uploadValues() {
+                    gl.uniform1f(glUniforms.hasValues, values.length ? 1 : 0);
+                    if (!values.length) {
+                        return;
+                    }
+                    
+                    // Float32Array input covering every node goes straight to the GPU;
+                    // shorter inputs are tiled across the nodes first
+                    let data = values;
+                    if (!(values instanceof Float32Array) || values.length < NODE_COUNT) {
+                        for (let i = 0; i < NODE_COUNT; i++) {
+                            instanceValues[i] = values[i % values.length];
+                        }
+                        data = instanceValues;
+                    } else if (values.length > NODE_COUNT) {
+                        data = values.subarray(0, NODE_COUNT);
+                    }
+                    gl.bindBuffer(gl.ARRAY_BUFFER, valueBuffer);
+                    gl.bufferSubData(gl.ARRAY_BUFFER, 0, data);
+                }
+                
+                function drawGL() {
+                    gl.viewport(0, 0, canvas.width, canvas.height);
+                    gl.clear(gl.COLOR_BUFFER_BIT);
+                    gl.uniform1f(glUniforms.time, time);
+                    gl.uniform2f(glUniforms.resolution, canvas.width, canvas.height);
+                    instancing.drawArraysInstancedANGLE(gl.TRIANGLE_STRIP, 0, 4, NODE_COUNT);
+                }
+                
+                if (useGL) {
+                    initGL();
+                }
+                
+                // Only schedule a frame when there is something to draw
+                function requestRender() {
+                    needsRender = true;
+                    if (animationFrame === null) {
+                        animationFrame = requestAnimationFrame(draw);
+                    }
+                }
+                
+                function sameValues(a, b) {
+                    if (a.length !== b.length) return false;
+                    for (let i = 0; i < a.length; i++) {
+                        if (a[i] !== b[i]) return false;
+                    }
+                    return true;
+                }
+                
+                // Draw function
+                function draw() {
+                    animationFrame = null;
+                    if (!needsRender && !animating) {
+                        return;
+                    }
+                    needsRender = false;
+                    
+                    if (useGL) {
+                        drawGL();
+                    } else {
+                        draw2D();
+                    }
+                    
+                    // Advance the pulse only while animating
+                    if (animating) {
+                        time += 0.02;
+                        animationFrame = requestAnimationFrame(draw);
+                    }
+                }
+                
+                // Canvas2D fallback renderer
+                function draw2D() {
+                    // Clear with transparent background
+                    ctx.clearRect(0, 0, canvas.width, canvas.height);
+                    
+                    // Draw neural network visualization
+                    const centerX = canvas.width / 2;
+                    const centerY = canvas.height / 2;
+                    
+                    // Compute node positions and pulses
+                    for (let i = 0; i < NODE_COUNT; i++) {
+                        const angle = (i / NODE_COUNT) * Math.PI * 2;
+                        const radius = 100 + Math.sin(time + i * 0.2) * 20;
+                        nodeX[i] = centerX + Math.cos(angle) * radius;
+                        nodeY[i] = centerY + Math.sin(angle) * radius;
+                        
+                        // Pulsing effect, driven by the node value when one is set
+                        let pulse = Math.sin(time + i * 0.3) * 0.5 + 0.5;
+                        if (values.length) {
+                            pulse = Math.min(1, Math.max(0, values[i % values.length]));
+                        }
+                        nodePulse[i] = pulse;
+                    }
+                    
+                    // Glow: blit the pre-rendered sprite, fading with the pulse
+                    for (let i = 0; i < NODE_COUNT; i++) {
+                        ctx.globalAlpha = nodePulse[i];
+                        ctx.drawImage(glowSprite, nodeX[i] - GLOW_RADIUS, nodeY[i] - GLOW_RADIUS);
+                    }
+                    ctx.globalAlpha = 1;
+                    
+                    // Nodes: one path per alpha level instead of one fill per node
+                    const corePaths = [];
+                    for (let level = 0; level < CORE_LEVELS; level++) {
+                        corePaths.push(new Path2D());
+                    }
+                    for (let i = 0; i < NODE_COUNT; i++) {
+                        const level = Math.min(CORE_LEVELS - 1, Math.floor(nodePulse[i] * CORE_LEVELS));
+                        const r = 3 + nodePulse[i] * 2;
+                        corePaths[level].moveTo(nodeX[i] + r, nodeY[i]);
+                        corePaths[level].arc(nodeX[i], nodeY[i], r, 0, Math.PI * 2);
+                    }
+                    for (let level = 0; level < CORE_LEVELS; level++) {
+                        const pulse = (level + 0.5) / CORE_LEVELS;
+                        ctx.fillStyle = `rgba(255, 255, 255, ${0.7 + 0.3 * pulse})`;
+                        ctx.fill(corePaths[level]);
+                    }
+                }
+                
+                // Bridge functions called from Python
+                window.generateNetwork = function(payload) {
+                    network = JSON.parse(payload);
+                    requestRender();
+                };
+                
+                function applyValues(next) {
+                    if (!sameValues(values, next)) {
+                        values = next;
+                        if (useGL) {
+                            uploadValues();
+                        }
+                        requestRender();
+                    }
+                }
+                
+                window.updateNetwork = function(payload) {
+                    const data = JSON.parse(payload);
+                    if (data.values) {
+                        applyValues(data.values);
+                    }
+                };
+                
+                // Packed float32 values pushed through the Qt bridge object
+                window.updateValues = function(buf) {
+                    const bytes = buf instanceof ArrayBuffer ? buf : (buf.buffer || buf);
+                    applyValues(new Float32Array(bytes));
+                };
+                
+                window.setAnimating = function(enabled) {
+                    animating = !!enabled;
+                    if (animating) {
+                        requestRender();
+                    }
+                };
+                
+                // Handle resize
+                window.addEventListener('resize', () => {
+                    canvas.width = window.innerWidth;
+                    canvas.height = window.innerHeight;
+                    requestRender();
+                });
+                
+                if (window.bridge) {
+                    bridge.valuesUpdated.connect(window.updateValues);
+                }
+                
+                // Draw the initial frame
+                requestRender();
+            </script>
+        </body>
+        </html>
+        """
+
+# Encode the inline page once so each widget loads it without rebuilding the HTML
+if QTWEBKIT_AVAILABLE:
+    _INLINE_HTML_URL = QUrl('data:text/html;base64,' + base64.b64encode(_INLINE_HTML.encode('utf-8')).decode('ascii'))
+else:
+    _INLINE_HTML_URL = None
+
+# Characters that must be escaped to splice a string into a single-quoted JS literal
+_JS_ESCAPE_TABLE = str.maketrans({
+    '\\': '\\\\',
+    "'": "\\'",
+    '\n': '\\n',
+    '\r': '\\r',
+    '\u2028': '\\u2028',
+    '\u2029': '\\u2029',
+})
+
+def _js_escape(text):
+    """Escape text for use inside a single-quoted JavaScript string"""
+    return text.translate(_JS_ESCAPE_TABLE)
+
+def _freeze(value):
+    """Convert nested lists/dicts/arrays into a comparable snapshot"""
+    if hasattr(value, 'tobytes'):
+        # Same bytes can mean different data under another dtype or shape
+        return (str(getattr(value, 'dtype', '')), getattr(value, 'shape', None), value.tobytes())
+    if isinstance(value, dict):
+        # Insertion order, like json.dumps; sorting fails on mixed key types
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _payload_key(*parts):
+    """Return a frozen copy of an update payload to compare against the next one"""
+    return _freeze(parts)
+
+def _same_payload(key, last_key):
+    """True if two frozen payloads are equal; False if they cannot be compared"""
+    if last_key is None:
+        return False
+    try:
+        return bool(key == last_key)
+    except Exception:
+        return False
+
+@lru_cache(maxsize=4)
+def _read_html(path):
+    """Read an HTML asset from disk, cached across widget instances"""
+    return Path(path).read_bytes()
+
+class VisualizationBridge(QObject):
+    """Object exposed to the page as ``window.bridge`` for pushing binary updates"""
+    
+    valuesUpdated = pyqtSignal(QByteArray)
+    
+    def send_values(self, values):
+        """Pack values as little-endian float32 and emit them to JavaScript"""
+        if np is not None:
+            buf = np.asarray(values, dtype='<f4').tobytes()
+        else:
+            buf = struct.pack(f'<{len(values)}f', *values)
+        self.valuesUpdated.emit(QByteArray(buf))
 
 class QtWebNeuralVisualization(QWidget):
     """Qt-based Neural Network Visualization"""
     
+    # Whether assets/neural_vis/index.html exists; stat'ed by the first instance
+    _html_found = None
+    
     def __init__(self):
         """Initialize the visualization widget"""
         print("Initializing QtWebNeuralVisualization")
+        _ensure_qt()
         super().__init__(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         
         # Set up transparency
@@ -72,17 +505,31 @@ class QtWebNeuralVisualization(QWidget):
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.setSpacing(0)
         
+        # Updates are coalesced and flushed at most once per event loop pass
+        self._pending_values = None
+        self._pending_connections = None
+        self._flush_scheduled = False
+        
+        # Digests of the last payloads, used to skip no-op updates
+        self._last_network_key = None
+        self._last_update_key = None
+        self._last_network = None
+        
         # Get the path to the HTML file
         script_dir = os.path.dirname(os.path.abspath(__file__))
         project_dir = os.path.dirname(script_dir)
         self.html_path = os.path.join(project_dir, "assets", "neural_vis", "index.html")
         print(f"HTML file path: {self.html_path}")
         
-        # Check if the HTML file exists, create directory if needed
-        html_dir = os.path.dirname(self.html_path)
-        if not os.path.exists(html_dir):
-            print(f"Creating HTML directory: {html_dir}")
-            os.makedirs(html_dir, exist_ok=True)
+        # Create the directory if needed and check for the HTML file once
+        # per process; neither changes while the HUD runs
+        if QtWebNeuralVisualization._html_found is None:
+            os.makedirs(os.path.dirname(self.html_path), exist_ok=True)
+            try:
+                os.stat(self.html_path)
+                QtWebNeuralVisualization._html_found = True
+            except FileNotFoundError:
+                QtWebNeuralVisualization._html_found = False
         
         # Handle case when QtWebKit is not available
         if not QTWEBKIT_AVAILABLE:
@@ -91,14 +538,22 @@ class QtWebNeuralVisualization(QWidget):
             return
         
         # Create the WebView with optimized settings
-        print("Creating WebView")
-        self.webview = QWebView()
-        self.webview.setStyleSheet("background: transparent;")
+        self.gl_view = None
+        if QTOPENGL_AVAILABLE:
+            self._create_gl_webview()
+        else:
+            print("Creating WebView")
+            self.webview = QWebView()
+            self.webview.setStyleSheet("background: transparent;")
+            
+            # Make WebView transparent and non-interactive
+            self.webview.setAttribute(Qt.WA_TranslucentBackground)
+            self.webview.setAttribute(Qt.WA_TransparentForMouseEvents)
+            self.webview.setWindowFlags(Qt.FramelessWindowHint)
         
-        # Make WebView transparent and non-interactive
-        self.webview.setAttribute(Qt.WA_TranslucentBackground)
-        self.webview.setAttribute(Qt.WA_TransparentForMouseEvents)
-        self.webview.setWindowFlags(Qt.FramelessWindowHint)
+        # Expose the update bridge to every page loaded in the frame
+        self.bridge = VisualizationBridge(self)
+        self.webview.page().mainFrame().javaScriptWindowObjectCleared.connect(self._expose_bridge)
         
         # Optimize WebView performance
         print("Configuring WebView settings")
@@ -115,12 +570,15 @@ class QtWebNeuralVisualization(QWidget):
         self.webview.page().mainFrame().setScrollBarPolicy(Qt.Horizontal, Qt.ScrollBarAlwaysOff)
         self.webview.page().mainFrame().setScrollBarPolicy(Qt.Vertical, Qt.ScrollBarAlwaysOff)
         
-        # Set the transparent backgrounds
-        self.webview.setStyleSheet("background: transparent; background-color: transparent;")
-        
         # Add the webview to the layout
-        print("Adding WebView to layout")
-        self.layout.addWidget(self.webview)
+        if self.gl_view is not None:
+            print("Adding GL view to layout")
+            self.layout.addWidget(self.gl_view)
+        else:
+            # Set the transparent backgrounds
+            self.webview.setStyleSheet("background: transparent; background-color: transparent;")
+            print("Adding WebView to layout")
+            self.layout.addWidget(self.webview)
         
         # Load HTML file with a short delay to ensure widget is properly set up
         print("Scheduling HTML content load")
@@ -130,12 +588,38 @@ class QtWebNeuralVisualization(QWidget):
         self.show()
         self.webview.show()
     
+    def _create_gl_webview(self):
+        """Host the web view in a graphics scene with an OpenGL viewport"""
+        print("Creating WebView on OpenGL viewport")
+        self.scene = QGraphicsScene(self)
+        self.gl_view = QGraphicsView(self.scene)
+        self.gl_view.setViewport(QGLWidget(QGLFormat(QGL.SampleBuffers | QGL.AlphaChannel)))
+        self.gl_view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.gl_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.gl_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.gl_view.setFrameShape(QGraphicsView.NoFrame)
+        self.gl_view.setStyleSheet("background: transparent; border: none;")
+        self.gl_view.setAttribute(Qt.WA_TransparentForMouseEvents)
+        
+        self.webview = QGraphicsWebView()
+        self.scene.addItem(self.webview)
+    
+    def _expose_bridge(self):
+        """Re-register the bridge object after the JS window object is reset"""
+        self.webview.page().mainFrame().addToJavaScriptWindowObject('bridge', self.bridge)
+    
+    def grab_frame(self):
+        """Read the GL framebuffer back, or None when rendering in software"""
+        if getattr(self, 'gl_view', None) is None:
+            return None
+        return self.gl_view.viewport().grabFrameBuffer(True)
+    
     def _load_content(self):
         """Load the visualization content with a slight delay for better stability"""
-        if os.path.exists(self.html_path):
+        if QtWebNeuralVisualization._html_found:
             print(f"Loading neural visualization from: {self.html_path}")
             url = QUrl.fromLocalFile(self.html_path)
-            self.webview.load(url)
+            self.webview.setContent(_read_html(self.html_path), 'text/html', url)
         else:
             # If file doesn't exist, create a basic visualization with inline HTML
             self._create_inline_visualization()
@@ -149,108 +633,39 @@ class QtWebNeuralVisualization(QWidget):
     
     def _create_inline_visualization(self):
         """Create a basic visualization using inline HTML when the file doesn't exist"""
-        # Basic HTML with canvas visualization
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body, html {
-                    margin: 0;
-                    padding: 0;
-                    width: 100%;
-                    height: 100%;
-                    overflow: hidden;
-                    background-color: rgba(0, 0, 0, 0);
-                }
-                canvas {
-                    display: block;
-                    width: 100%;
-                    height: 100%;
-                }
-            </style>
-        </head>
-        <body>
-            <canvas id="canvas"></canvas>
-            <script>
-                const canvas = document.getElementById('canvas');
-                const ctx = canvas.getContext('2d');
-                
-                // Set canvas dimensions
-                canvas.width = window.innerWidth;
-                canvas.height = window.innerHeight;
-                
-                // Animation parameters
-                let animationFrame;
-                let time = 0;
-                
-                // Draw function
-                function draw() {
-                    // Clear with transparent background
-                    ctx.clearRect(0, 0, canvas.width, canvas.height);
-                    
-                    // Draw neural network visualization
-                    const centerX = canvas.width / 2;
-                    const centerY = canvas.height / 2;
-                    
-                    // Draw pulsing nodes
-                    for (let i = 0; i < 30; i++) {
-                        const angle = (i / 30) * Math.PI * 2;
-                        const radius = 100 + Math.sin(time + i * 0.2) * 20;
-                        const x = centerX + Math.cos(angle) * radius;
-                        const y = centerY + Math.sin(angle) * radius;
-                        
-                        // Pulsing effect
-                        const pulse = Math.sin(time + i * 0.3) * 0.5 + 0.5;
-                        
-                        // Glow
-                        const gradient = ctx.createRadialGradient(x, y, 0, x, y, 15);
-                        gradient.addColorStop(0, `rgba(0, 191, 255, ${0.8 * pulse})`);
-                        gradient.addColorStop(1, 'rgba(0, 0, 0, 0)');
-                        
-                        ctx.beginPath();
-                        ctx.arc(x, y, 15, 0, Math.PI * 2);
-                        ctx.fillStyle = gradient;
-                        ctx.fill();
-                        
-                        // Node
-                        ctx.beginPath();
-                        ctx.arc(x, y, 3 + pulse * 2, 0, Math.PI * 2);
-                        ctx.fillStyle = `rgba(255, 255, 255, ${0.7 + 0.3 * pulse})`;
-                        ctx.fill();
-                    }
-                    
-                    // Update time
-                    time += 0.02;
-                    
-                    // Repeat
-                    animationFrame = requestAnimationFrame(draw);
-                }
-                
-                // Handle resize
-                window.addEventListener('resize', () => {
-                    canvas.width = window.innerWidth;
-                    canvas.height = window.innerHeight;
-                });
-                
-                // Start animation
-                draw();
-            </script>
-        </body>
-        </html>
-        """
-        self.webview.setHtml(html, QUrl("file:///"))
+        # The page is encoded once at import time as a data URL
+        self.webview.load(_INLINE_HTML_URL)
     
     def resizeEvent(self, event):
         """Handle resize events to update the visualization size"""
         super().resizeEvent(event)
         if hasattr(self, 'webview'):
-            self.webview.resize(self.size())
+            self.webview.resize(self.width(), self.height())
+            if self.gl_view is not None:
+                self.scene.setSceneRect(0, 0, self.width(), self.height())
+    
+    def reset(self):
+        """Prepare a reused widget for a new owner without reloading the page"""
+        self._pending_values = None
+        self._pending_connections = None
+        self._last_update_key = None
+        
+        # Re-send the current topology so the page matches the new session
+        network = self._last_network
+        self._last_network_key = None
+        if network is not None:
+            self.generate_network(*network)
     
     def generate_network(self, num_layers, nodes_per_layer, connections=None):
         """Generate a neural network with the given parameters"""
         if not hasattr(self, 'webview') or not QTWEBKIT_AVAILABLE:
             return
+        
+        network_key = _payload_key(num_layers, nodes_per_layer, connections)
+        if _same_payload(network_key, self._last_network_key):
+            return
+        self._last_network_key = network_key
+        self._last_network = (num_layers, nodes_per_layer, connections)
             
         # Create the network data structure
         network_data = {
@@ -259,11 +674,9 @@ class QtWebNeuralVisualization(QWidget):
             'connections': connections or []
         }
         
-        # Convert to JSON
-        network_json = json.dumps(network_data)
-        
-        # Escape the JSON for JavaScript
-        escaped_json = quote(network_json)
+        # Convert to compact JSON and escape it as a JS string literal
+        network_json = json.dumps(network_data, separators=(',', ':'))
+        escaped_json = _js_escape(network_json)
         
         # Call the JavaScript function
         js_code = f"if (typeof generateNetwork === 'function') {{ generateNetwork('{escaped_json}'); }}"
@@ -273,21 +686,47 @@ class QtWebNeuralVisualization(QWidget):
         """Update the visualization with new values and connections"""
         if not hasattr(self, 'webview') or not QTWEBKIT_AVAILABLE:
             return
-            
-        # Create the update data
-        update_data = {
-            'values': values or [],
-            'connections': connections or []
-        }
         
-        # Convert to JSON
-        update_json = json.dumps(update_data)
+        update_key = _payload_key(values, connections)
+        if _same_payload(update_key, self._last_update_key):
+            return
+        self._last_update_key = update_key
         
-        # Escape the JSON for JavaScript
-        escaped_json = quote(update_json)
+        # Only the latest state before the next frame is visible, so just stash it
+        if values is not None:
+            self._pending_values = values
+        if connections:
+            self._pending_connections = connections
         
-        # Call the JavaScript function
-        js_code = f"if (typeof updateNetwork === 'function') {{ updateNetwork('{escaped_json}'); }}"
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self._flush_update)
+    
+    def _flush_update(self):
+        """Send the most recent pending update to the page"""
+        self._flush_scheduled = False
+        values, self._pending_values = self._pending_values, None
+        connections, self._pending_connections = self._pending_connections, None
+        
+        # Values go through the bridge as packed float32, no JS source is compiled
+        if values is not None:
+            self.bridge.send_values(values)
+        
+        # Topology changes are rare and keep the JSON path
+        if connections:
+            update_json = json.dumps({'connections': connections}, separators=(',', ':'))
+            escaped_json = _js_escape(update_json)
+            
+            # Call the JavaScript function
+            js_code = f"if (typeof updateNetwork === 'function') {{ updateNetwork('{escaped_json}'); }}"
+            self.webview.page().mainFrame().evaluateJavaScript(js_code)
+    
+    def set_animating(self, animating):
+        """Enable or disable the continuous pulse animation"""
+        if not hasattr(self, 'webview') or not QTWEBKIT_AVAILABLE:
+            return
+            
+        js_code = f"if (typeof setAnimating === 'function') {{ setAnimating({'true' if animating else 'false'}); }}"
         self.webview.page().mainFrame().evaluateJavaScript(js_code)
 
 # Create a GTK wrapper class to integrate with Hextrix OS
@@ -298,6 +737,7 @@ class QtToGtkWidget(Gtk.DrawingArea):
         """Initialize the widget with a Qt widget"""
         print("Initializing QtToGtkWidget")
         super().__init__()
+        _ensure_qt()
         
         # Initialize Qt application if not already initialized at module level
         self.qapp = qt_app if qt_app else QApplication.instance()
@@ -323,104 +763,203 @@ class QtToGtkWidget(Gtk.DrawingArea):
         # Initialize size
         self.set_size_request(800, 600)
         
-        # Set up a timer to process Qt events (roughly 60 FPS)
-        self.last_process_time = time.time()
-        print("Setting up Qt event processing timer")
-        GLib.timeout_add(16, self._process_qt_events)
+        # Qt events are pumped from the GTK frame clock once realized
+        self.last_process_time = time.monotonic()
+        self._slow_frames = 0
+        self._tick_id = None
         
-        # Set up a slower timer to check if Qt is alive
-        print("Setting up Qt alive check timer")
-        GLib.timeout_add(500, self._check_qt_alive)
+        # Render target: Qt renders into it on the frame tick and the draw
+        # handler only blits it. Both run on the GTK main thread, so one
+        # buffer is enough.
+        self._image = None
+        self._surface = None
+        self._frame_dirty = True
+        self._pending_damage = None
+        
+        # Render below native resolution and let cairo upscale while painting
+        self._render_scale = 0.5
+        
+        # Only re-render when WebKit reports that pixels changed
+        if hasattr(self.qt_widget, 'webview'):
+            print("Connecting Qt repaint signal")
+            self.qt_widget.webview.page().repaintRequested.connect(self._on_qt_repaint)
         
         # Print diagnostic info
         if QTWEBKIT_AVAILABLE:
             print("Qt neural visualization widget initialized successfully")
     
+    def detach(self):
+        """Disconnect from the Qt widget so it can outlive this GTK widget"""
+        if hasattr(self.qt_widget, 'webview'):
+            try:
+                self.qt_widget.webview.page().repaintRequested.disconnect(self._on_qt_repaint)
+            except TypeError:
+                pass
+        if self._tick_id is not None:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+    
     def _on_realize(self, widget):
         """Called when the widget is realized"""
         print("GTK widget realized")
         # Make sure the Qt widget is visible
         self.qt_widget.show()
         self.qt_widget.raise_()
+        
+        # Pace Qt event processing to the display refresh
+        if self._tick_id is None:
+            print("Adding frame clock tick callback")
+            self._tick_id = self.add_tick_callback(self._on_frame)
+        
         self.queue_draw()  # Force initial draw
         return True
         
     def _on_configure(self, widget, event):
         """Called when the widget is resized"""
         print(f"GTK widget configured: {event.width}x{event.height}")
-        # Resize the Qt widget to match the GTK widget
-        self.qt_widget.resize(event.width, event.height)
+        # Resize the Qt widget to the scaled render size
+        width, height = self._scaled_size(event.width, event.height)
+        self.qt_widget.resize(width, height)
+        self._allocate_render_image(width, height)
         self.queue_draw()  # Force redraw after resize
         return False
+    
+    def _scaled_size(self, width, height):
+        """Return the render buffer size for a given widget size"""
+        return (max(1, int(width * self._render_scale)),
+                max(1, int(height * self._render_scale)))
+    
+    def set_render_scale(self, scale):
+        """Set the fraction of the widget resolution the visualization renders at"""
+        scale = min(1.0, max(0.1, float(scale)))
+        if scale == self._render_scale:
+            return
+        self._render_scale = scale
+        size = self.get_allocation()
+        width, height = self._scaled_size(size.width, size.height)
+        self.qt_widget.resize(width, height)
+        self._allocate_render_image(width, height)
+        self.queue_draw()
+    
+    def _allocate_render_image(self, width, height):
+        """(Re)create the render target for the given size"""
+        # Premultiplied ARGB32 matches cairo.FORMAT_ARGB32 byte-for-byte
+        self._image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        self._image.fill(Qt.transparent)
         
-    def _on_draw(self, widget, context):
-        """Draw the Qt widget on the GTK widget"""
-        print("Drawing Qt widget on GTK context")
-        # Process Qt events to make sure the widget is up to date
-        self._process_qt_events()
+        # Wrap the buffer in a cairo surface once; pointer and stride stay fixed until resize
+        self._surface = self._wrap_image(self._image)
+        self._frame_dirty = True
+        self._pending_damage = None
+    
+    def _wrap_image(self, image):
+        """Create a cairo surface sharing the QImage pixel buffer"""
+        ptr = image.bits()
+        if hasattr(ptr, 'setsize'):
+            ptr.setsize(image.byteCount())
+        return cairo.ImageSurface.create_for_data(
+            ptr, cairo.FORMAT_ARGB32, image.width(), image.height(), image.bytesPerLine())
+    
+    def _on_qt_repaint(self, rect):
+        """Mark the frame dirty and accumulate the WebKit damage rectangle"""
+        self._frame_dirty = True
+        if self._pending_damage is None:
+            self._pending_damage = rect
+        else:
+            self._pending_damage = self._pending_damage.united(rect)
+    
+    def _queue_damage(self):
+        """Invalidate only the widget area covered by the pending damage"""
+        damage, self._pending_damage = self._pending_damage, None
+        if damage is None or damage.isEmpty() or not hasattr(self, 'queue_draw_area'):
+            self.queue_draw()
+            return
         
-        # Create a pixmap from the Qt widget
+        # Map from render-buffer to widget coordinates, padding for bilinear filtering
+        inverse = 1.0 / self._render_scale
+        x = max(0, int(damage.x() * inverse) - 1)
+        y = max(0, int(damage.y() * inverse) - 1)
+        width = int(damage.width() * inverse) + 2
+        height = int(damage.height() * inverse) + 2
+        self.queue_draw_area(x, y, width, height)
+    
+    def _render_frame(self):
+        """Render the Qt widget into the render target"""
         size = self.get_allocation()
-        print(f"Creating pixmap of size: {size.width}x{size.height}")
-        pixmap = QPixmap(size.width, size.height)
-        pixmap.fill(Qt.transparent)
-        
-        # Render the Qt widget to the pixmap
-        print("Rendering Qt widget to pixmap")
-        self.qt_widget.render(pixmap)
+        width, height = self._scaled_size(size.width, size.height)
+        if self._image is None or self._image.width() != width or self._image.height() != height:
+            self._allocate_render_image(width, height)
+        image = self._image
         
-        # Convert the pixmap to a cairo surface
-        if hasattr(pixmap, 'toImage'):
-            qimage = pixmap.toImage()
+        # Prefer the GPU-composited frame; fall back to the software rasterizer
+        image.fill(Qt.transparent)
+        frame = self.qt_widget.grab_frame() if hasattr(self.qt_widget, 'grab_frame') else None
+        if frame is not None and not frame.isNull():
+            painter = QPainter(image)
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.drawImage(0, 0, frame)
+            painter.end()
         else:
-            qimage = pixmap.convertToImage()
+            self.qt_widget.render(image)
+        
+        # Qt wrote to the pixels behind cairo's back
+        self._surface.mark_dirty()
+        
+    def _on_draw(self, widget, context):
+        """Blit the most recently rendered frame onto the GTK widget"""
+        if self._image is None:
+            self._render_frame()
             
-        # Create a cairo surface from the QImage
+        # Paint the cached surface
         try:
-            print("Creating cairo surface from QImage")
-            # Get access to the QImage data
-            ptr = qimage.bits()
-            if hasattr(ptr, 'setsize'):
-                ptr.setsize(qimage.byteCount())
-            
-            # Create a cairo surface
-            stride = qimage.bytesPerLine()
-            format = cairo.FORMAT_ARGB32
+            # The HUD background is transparent, so overwrite instead of blending.
+            # GTK has already clipped the context to the area queued by
+            # _queue_damage, so paint() only touches the damaged pixels.
+            context.set_operator(cairo.OPERATOR_SOURCE)
             
-            surface = cairo.ImageSurface.create_for_data(
-                ptr, format, qimage.width(), qimage.height(), stride)
-            
-            # Draw the surface on the context
-            print("Drawing surface on GTK context")
-            context.set_source_surface(surface, 0, 0)
+            # Upscale the reduced-resolution frame onto the context
+            context.scale(1.0 / self._render_scale, 1.0 / self._render_scale)
+            context.set_source_surface(self._surface, 0, 0)
+            context.get_source().set_filter(cairo.FILTER_BILINEAR)
             context.paint()
         except Exception as e:
             print(f"Error rendering Qt widget to GTK: {e}")
         
         return False
     
+    def _on_frame(self, widget, frame_clock):
+        """Process pending Qt events and re-render if WebKit repainted"""
+        self._process_qt_events()
+        if self._frame_dirty:
+            self._frame_dirty = False
+            self._render_frame()
+            self._queue_damage()
+        return GLib.SOURCE_CONTINUE
+    
     def _process_qt_events(self):
-        """Process Qt events in the GTK main loop"""
+        """Process Qt events in the GTK main loop within a fixed time budget"""
         try:
             if QApplication.instance():
-                QApplication.instance().processEvents()
-                self.last_process_time = time.time()
+                start = time.monotonic()
+                QApplication.instance().processEvents(
+                    QEventLoop.ExcludeUserInputEvents | QEventLoop.ExcludeSocketNotifiers,
+                    QT_EVENT_BUDGET_MS)
+                self.last_process_time = time.monotonic()
+                
+                # Consistently using the whole budget means we are missing frames
+                if self.last_process_time - start >= QT_EVENT_BUDGET_MS / 1000.0:
+                    self._slow_frames += 1
+                    if self._slow_frames > 3 and self._render_scale > 0.25:
+                        print("Qt event processing over budget, lowering render scale")
+                        self.set_render_scale(max(0.25, self._render_scale * 0.5))
+                        self._slow_frames = 0
+                else:
+                    self._slow_frames = 0
         except Exception as e:
             print(f"Error processing Qt events: {e}")
-        return True  # Continue the timer
-    
-    def _check_qt_alive(self):
-        """Check if the Qt event processing is still working"""
-        current_time = time.time()
-        time_since_last_process = current_time - self.last_process_time
-        
-        # If it's been more than 500ms since we processed events, force an update
-        if time_since_last_process > 0.5:
-            print("Qt seems stuck, forcing event processing...")
-            self._process_qt_events()
-            self.queue_draw()  # Force a redraw
-        
-        return True  # Continue the timer
+
+# Qt widget shared by every WebNeuralVisualization
+_SINGLETON_QT_WIDGET = None
 
 # Export a combined class for use in Hextrix
 class WebNeuralVisualization(Gtk.Box):
@@ -430,8 +969,13 @@ class WebNeuralVisualization(Gtk.Box):
         """Initialize the visualization widget"""
         super(WebNeuralVisualization, self).__init__()
         
-        # Create the Qt widget
-        self.qt_widget = QtWebNeuralVisualization()
+        # Reuse the Qt widget across HUD toggles so WebKit is only initialized once
+        global _SINGLETON_QT_WIDGET
+        if _SINGLETON_QT_WIDGET is None:
+            _SINGLETON_QT_WIDGET = QtWebNeuralVisualization()
+        else:
+            _SINGLETON_QT_WIDGET.reset()
+        self.qt_widget = _SINGLETON_QT_WIDGET
         
         # Create the bridge between Qt and GTK
         self.gtk_widget = QtToGtkWidget(self.qt_widget)
@@ -473,6 +1017,16 @@ class WebNeuralVisualization(Gtk.Box):
         if hasattr(self, 'qt_widget'):
             self.qt_widget.update(values, connections)
     
+    def set_render_scale(self, scale):
+        """Trade resolution for speed, e.g. 0.25 in degraded mode"""
+        if hasattr(self, 'gtk_widget'):
+            self.gtk_widget.set_render_scale(scale)
+    
+    def set_animating(self, animating):
+        """Enable or disable the continuous pulse animation"""
+        if hasattr(self, 'qt_widget'):
+            self.qt_widget.set_animating(animating)
+    
     def draw(self, cr, width, height):
         """Draw the visualization on a Cairo context - this is a no-op
         as the drawing is handled by QtToGtkWidget"""
@@ -481,10 +1035,11 @@ class WebNeuralVisualization(Gtk.Box):
         pass
     
     def destroy(self):
-        """Cleanup resources"""
+        """Cleanup resources, keeping the shared Qt widget alive for reuse"""
+        if hasattr(self, 'gtk_widget'):
+            self.gtk_widget.detach()
         if hasattr(self, 'qt_widget'):
-            self.qt_widget.close()
-            self.qt_widget.deleteLater()
+            self.qt_widget.hide()
         super(WebNeuralVisualization, self).destroy()
 
 # For testing the Qt widget directly
@@ -1,12 +1,28 @@
 import gi
 gi.require_version('Gtk', '4.0')
-from gi.repository import Gtk, Gdk, GLib, Pango
+from gi.repository import Gtk, Gdk, GLib, Gio, Pango
 import platform
+import re
 import shlex
-import subprocess
 import sys
 import os
+import stat
+import time
+import bisect
+import functools
+import io
+import threading
 import psutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Owner/group name lookups are POSIX-only
+try:
+    import pwd
+    import grp
+except ImportError:
+    pwd = None
+    grp = None
 
 # Make VTE import conditional since it may not be available on Windows
 VTE_AVAILABLE = False
@@ -31,7 +47,244 @@ except (ValueError, ImportError) as e:
     print(f"VTE terminal not available: {e}")
     print("Terminal functionality will be limited.")
 
+# Stylesheet for the panel, kept as bytes for Gtk.CssProvider.load_from_data
+TERMINAL_CSS_BYTES = b"""
+    .terminal-panel {
+        background-color: rgba(0, 10, 30, 0.8);
+        border-radius: 5px;
+        border: 1px solid rgba(0, 191, 255, 0.3);
+    }
+    .terminal-panel-toolbar {
+        background-color: rgba(0, 30, 60, 0.8);
+        border-bottom: 1px solid rgba(0, 191, 255, 0.3);
+    }
+    .tool-button {
+        background-color: rgba(0, 40, 80, 0.7);
+        border-radius: 4px;
+        border: 1px solid rgba(0, 191, 255, 0.5);
+        padding: 2px;
+        transition: all 0.2s ease;
+    }
+    .tool-button:hover {
+        background-color: rgba(0, 70, 130, 0.8);
+        border-color: rgba(0, 255, 255, 0.8);
+    }
+    notebook tab {
+        background-color: rgba(0, 20, 50, 0.7);
+        padding: 2px 8px;
+        border: 1px solid rgba(0, 191, 255, 0.3);
+        color: #00BFFF;
+    }
+    notebook tab:checked {
+        background-color: rgba(0, 40, 90, 0.8);
+        border-bottom: 1px solid #00BFFF;
+    }
+    entry {
+        background-color: rgba(0, 20, 50, 0.8);
+        color: #00BFFF;
+        border: 1px solid rgba(0, 191, 255, 0.5);
+        border-radius: 4px;
+        padding: 4px 8px;
+    }
+    entry:focus {
+        border-color: rgba(0, 255, 255, 0.8);
+    }
+"""
+
+# Fixed banners, encoded once at import
+VERSION_BYTES = b"Hextrix OS HUD Terminal v1.0.0\n"
+PLATFORM_BYTES = f"Running on {platform.system()} {platform.release()}\n".encode()
+SHELL_FEATURES_BYTES = b"Enhanced Shell with command history and tab completion\n"
+NO_HISTORY_BYTES = b"No command history\n"
+EXITING_BYTES = b"Exiting shell...\n"
+
+# Shell started in each terminal tab
+SHELL_ARGV = ["/bin/bash"]
+
+# Bytes read per step when streaming a file to the terminal
+CAT_CHUNK_SIZE = 65536
+
+# Seconds a ps listing is reused for
+PS_CACHE_TTL = 0.5
+
+# Seconds tab-completion candidates are reused for
+COMPLETION_CACHE_TTL = 1.0
+
+# Seconds diag reuses partition, memory and network readings for
+DIAG_CACHE_TTL = 5
+
+# Minimum interval between history steps while Up/Down is held
+HISTORY_KEY_DEBOUNCE_MS = 50
+
+# "Key:   value kB" lines of /proc/meminfo
+_MEM_RE = re.compile(rb'(\w+):\s+(\d+)')
+
+
+@functools.lru_cache(maxsize=None)
+def _get_platform():
+    """Host platform details; constant for the process, so probed once."""
+    return {
+        "system": platform.system(),
+        "release": platform.release(),
+        "version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def _disk_usage_or_none(mountpoint):
+    """psutil.disk_usage, or None when the mount can't be stat'ed."""
+    try:
+        return psutil.disk_usage(mountpoint)
+    except OSError:
+        # Permission denied, stale NFS/FUSE mounts, mounts removed since listing
+        return None
+
+
+# Diagnostics probes below are keyed on int(time.monotonic()) // DIAG_CACHE_TTL,
+# so each one is re-read at most once per window
+@functools.lru_cache(maxsize=1)
+def _disk_parts(ts_bucket):
+    return psutil.disk_partitions(all=False)
+
+
+@functools.lru_cache(maxsize=1)
+def _virtual_mem(ts_bucket):
+    return psutil.virtual_memory()
+
+
+@functools.lru_cache(maxsize=1)
+def _net_counters(ts_bucket):
+    return psutil.net_io_counters(pernic=True)
+
+
+def _run_diag_worker():
+    """Build the diagnostics report; safe to call off the main thread."""
+    buf = io.StringIO()
+    bucket = int(time.monotonic()) // DIAG_CACHE_TTL
+    
+    # System information
+    buf.write("\n=== System Information ===\n")
+    plat = _get_platform()
+    buf.write(f"System: {plat['system']} {plat['release']}\n")
+    buf.write(f"Version: {plat['version']}\n")
+    buf.write(f"Machine: {plat['machine']}\n")
+    buf.write(f"Processor: {plat['processor']}\n")
+    
+    # Memory information
+    buf.write("\n=== Memory Information ===\n")
+    mem = _virtual_mem(bucket)
+    buf.write(f"Memory: {mem.total // (1024*1024)} MB total, "
+              f"{mem.used // (1024*1024)} MB used, "
+              f"{mem.available // (1024*1024)} MB free\n")
+    
+    # Disk information
+    buf.write("\n=== Disk Information ===\n")
+    # statvfs releases the GIL, so the per-mount calls overlap
+    parts = _disk_parts(bucket)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        usages = list(pool.map(_disk_usage_or_none, [part.mountpoint for part in parts]))
+    for part, usage in zip(parts, usages):
+        if usage is None:
+            buf.write(f"Partition: {part.device} mounted at {part.mountpoint} (Permission denied)\n")
+            continue
+        buf.write(f"Partition: {part.device} mounted at {part.mountpoint}\n")
+        buf.write(f"  Type: {part.fstype}\n")
+        buf.write(f"  Total: {usage.total // (1024*1024)} MB\n")
+        buf.write(f"  Used: {usage.used // (1024*1024)} MB ({usage.percent}%)\n")
+        buf.write(f"  Free: {usage.free // (1024*1024)} MB\n")
+    
+    # Network information
+    buf.write("\n=== Network Information ===\n")
+    try:
+        net_counters = _net_counters(bucket)
+        for name, stats in net_counters.items():
+            buf.write(f"Interface: {name}\n")
+            buf.write(f"  Bytes sent: {stats.bytes_sent}\n")
+            buf.write(f"  Bytes received: {stats.bytes_recv}\n")
+    except Exception as e:
+        buf.write(f"Error retrieving network info: {str(e)}\n")
+    
+    buf.write("\nDiagnostics completed.\n")
+    return buf.getvalue()
+
+
+def _collect_ps():
+    """Format the process table; safe to call off the main thread."""
+    rows = ["PID\tCPU%\tMEM%\tNAME"]
+    for proc in psutil.process_iter(attrs=['pid', 'name'], ad_value=None):
+        # oneshot() parses /proc/<pid>/stat once for both readings
+        try:
+            with proc.oneshot():
+                cpu = proc.cpu_percent()
+                mem = proc.memory_percent()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            cpu = mem = 0.0
+        info = proc.info
+        rows.append(f"{info['pid']}\t{cpu:.1f}\t{mem:.1f}\t{info['name']}")
+    return "\n".join(rows) + "\n"
+
+
 class TerminalPanel:
+    # Shared stylesheet, parsed once and installed once per display
+    _css_provider = None
+    _css_displays = set()
+
+    # Built-in shell commands as (name, description, handler method name)
+    _CUSTOM_COMMANDS_SPEC = (
+        # Shell commands
+        ("help", "Show available commands", "cmd_help"),
+        ("clear", "Clear the screen", "cmd_clear"),
+        ("echo", "Display text", "cmd_echo"),
+        ("history", "Show command history", "cmd_history"),
+        ("version", "Show OS version", "cmd_version"),
+        ("exit", "Exit the shell", "cmd_exit"),
+
+        # File system commands
+        ("ls", "List files in directory", "cmd_ls"),
+        ("cat", "Display file contents", "cmd_cat"),
+        ("rm", "Delete a file", "cmd_rm"),
+        ("pwd", "Show current directory", "cmd_pwd"),
+        ("cd", "Change current directory", "cmd_cd"),
+        ("mkdir", "Create a directory", "cmd_mkdir"),
+        ("write", "Create/edit a file", "cmd_write"),
+
+        # System info commands
+        ("meminfo", "Display memory usage", "cmd_meminfo"),
+        ("ps", "List running processes", "cmd_ps"),
+        ("kill", "Terminate a process", "cmd_kill"),
+        ("sleep", "Sleep for milliseconds", "cmd_sleep"),
+        ("diag", "Run system diagnostics", "cmd_diag"),
+    )
+
+    _HELP_CATEGORIES = {
+        "File System": ["ls", "cat", "rm", "pwd", "cd", "mkdir", "write"],
+        "System Info": ["meminfo", "ps", "kill", "diag"],
+        "Shell": ["help", "clear", "echo", "history", "version", "exit", "sleep"]
+    }
+
+    # Toolbar buttons as (attribute, icon name, tooltip, handler method name);
+    # _TOOLBAR sits before the command entry, _TOOLBAR_TRAILING after it
+    _TOOLBAR = (
+        ("new_tab_button", "tab-new-symbolic", "New Tab", "on_new_tab"),
+        ("copy_button", "edit-copy-symbolic", "Copy", "on_copy"),
+        ("paste_button", "edit-paste-symbolic", "Paste", "on_paste"),
+        ("clear_button", "edit-clear-all-symbolic", "Clear", "on_clear"),
+        ("font_smaller_button", "zoom-out-symbolic", "Decrease Font Size", "on_font_smaller"),
+        ("font_larger_button", "zoom-in-symbolic", "Increase Font Size", "on_font_larger"),
+        ("history_up_button", "go-up-symbolic", "Previous Command", "on_history_up"),
+        ("history_down_button", "go-down-symbolic", "Next Command", "on_history_down"),
+    )
+
+    _TOOLBAR_TRAILING = (
+        ("run_button", "system-run-symbolic", "Run Command", "on_run_command"),
+        ("help_button", "help-browser-symbolic", "Help", "on_help"),
+    )
+
+    # Filled in by the first init_custom_commands call
+    _descriptions = None
+    _help_lines = None
+
     def __init__(self, parent):
         self.parent = parent
         self.panel = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -47,34 +300,26 @@ class TerminalPanel:
         self.toolbar.set_margin_end(3)
         
         # Command history
-        self.command_history = []
-        self.history_position = -1
         self.HISTORY_MAX = 20
+        self.command_history = deque(maxlen=self.HISTORY_MAX)
+        self.history_position = -1
 
-        self.new_tab_button = self.create_tool_button("tab-new-symbolic", "New Tab", self.on_new_tab)
-        self.toolbar.append(self.new_tab_button)
-
-        self.copy_button = self.create_tool_button("edit-copy-symbolic", "Copy", self.on_copy)
-        self.toolbar.append(self.copy_button)
-
-        self.paste_button = self.create_tool_button("edit-paste-symbolic", "Paste", self.on_paste)
-        self.toolbar.append(self.paste_button)
-
-        self.clear_button = self.create_tool_button("edit-clear-all-symbolic", "Clear", self.on_clear)
-        self.toolbar.append(self.clear_button)
-
-        self.font_smaller_button = self.create_tool_button("zoom-out-symbolic", "Decrease Font Size", self.on_font_smaller)
-        self.toolbar.append(self.font_smaller_button)
+        # Sorted mirror of the history for Ctrl-R prefix search, and the
+        # (prefix, index, shown text) of the search in progress
+        self._history_sorted = []
+        self._history_search = ("", -1, None)
+        self._last_hist_key_ts = 0
 
-        self.font_larger_button = self.create_tool_button("zoom-in-symbolic", "Increase Font Size", self.on_font_larger)
-        self.toolbar.append(self.font_larger_button)
+        # Tab completion results keyed by (cwd, prefix, is_command) -> (timestamp, matches)
+        self._compl_cache = {}
 
-        # Add history navigation buttons
-        self.history_up_button = self.create_tool_button("go-up-symbolic", "Previous Command", self.on_history_up)
-        self.toolbar.append(self.history_up_button)
+        # (timestamp, output) of the last ps listing
+        self._ps_cache = (0, "")
 
-        self.history_down_button = self.create_tool_button("go-down-symbolic", "Next Command", self.on_history_down)
-        self.toolbar.append(self.history_down_button)
+        for attr, icon_name, tooltip, handler in self._TOOLBAR:
+            button = self.create_tool_button(icon_name, tooltip, getattr(self, handler))
+            setattr(self, attr, button)
+            self.toolbar.append(button)
 
         # Command entry
         self.cmd_entry = Gtk.Entry()
@@ -89,13 +334,10 @@ class TerminalPanel:
         self.toolbar.append(self.cmd_entry)
         self.cmd_entry.set_hexpand(True)
 
-        # Run button
-        self.run_button = self.create_tool_button("system-run-symbolic", "Run Command", self.on_run_command)
-        self.toolbar.append(self.run_button)
-
-        # Help button
-        self.help_button = self.create_tool_button("help-browser-symbolic", "Help", self.on_help)
-        self.toolbar.append(self.help_button)
+        for attr, icon_name, tooltip, handler in self._TOOLBAR_TRAILING:
+            button = self.create_tool_button(icon_name, tooltip, getattr(self, handler))
+            setattr(self, attr, button)
+            self.toolbar.append(button)
 
         self.panel.append(self.toolbar)
 
@@ -106,6 +348,7 @@ class TerminalPanel:
         self.panel.append(self.notebook)
 
         self.terminals = []
+        self._exit_watched = set()
         self.create_terminal_tab("Terminal")
 
         self.apply_styling()
@@ -113,8 +356,8 @@ class TerminalPanel:
         self.font_size = 12
         self.update_font()
 
-        # Initialize custom commands
-        self.init_custom_commands()
+        # Custom commands are set up on first use
+        self._handlers = None
 
         # Initialize terminal availability
         self.vte_available = VTE_AVAILABLE
@@ -123,139 +366,47 @@ class TerminalPanel:
         """Initialize custom commands from Hextrix OS shell"""
         # Debug message to confirm function is called
         print("Initializing custom commands")
-        self.custom_commands = {
-            # Shell commands
-            "help": {
-                "description": "Show available commands",
-                "handler": self.cmd_help
-            },
-            "clear": {
-                "description": "Clear the screen",
-                "handler": self.cmd_clear
-            },
-            "echo": {
-                "description": "Display text",
-                "handler": self.cmd_echo
-            },
-            "history": {
-                "description": "Show command history",
-                "handler": self.cmd_history
-            },
-            "version": {
-                "description": "Show OS version",
-                "handler": self.cmd_version
-            },
-            "exit": {
-                "description": "Exit the shell",
-                "handler": self.cmd_exit
-            },
-            
-            # File system commands
-            "ls": {
-                "description": "List files in directory",
-                "handler": self.cmd_ls
-            },
-            "cat": {
-                "description": "Display file contents",
-                "handler": self.cmd_cat
-            },
-            "rm": {
-                "description": "Delete a file",
-                "handler": self.cmd_rm
-            },
-            "pwd": {
-                "description": "Show current directory",
-                "handler": self.cmd_pwd
-            },
-            "cd": {
-                "description": "Change current directory",
-                "handler": self.cmd_cd
-            },
-            "mkdir": {
-                "description": "Create a directory",
-                "handler": self.cmd_mkdir
-            },
-            "write": {
-                "description": "Create/edit a file",
-                "handler": self.cmd_write
-            },
-            
-            # System info commands
-            "meminfo": {
-                "description": "Display memory usage",
-                "handler": self.cmd_meminfo
-            },
-            "ps": {
-                "description": "List running processes",
-                "handler": self.cmd_ps
-            },
-            "kill": {
-                "description": "Terminate a process",
-                "handler": self.cmd_kill
-            },
-            "sleep": {
-                "description": "Sleep for milliseconds",
-                "handler": self.cmd_sleep
-            },
-            "diag": {
-                "description": "Run system diagnostics",
-                "handler": self.cmd_diag
-            },
-        }
+        self._handlers = {name: getattr(self, handler) for name, _, handler in self._CUSTOM_COMMANDS_SPEC}
+
+        # Descriptions and the help listing are the same for every panel
+        cls = TerminalPanel
+        if cls._help_lines is None:
+            cls._descriptions = {name: description for name, description, _ in cls._CUSTOM_COMMANDS_SPEC}
+            max_name = max(len(name) for name in cls._descriptions)
+
+            lines = ["Available commands:", ""]
+            for category, cmds in cls._HELP_CATEGORIES.items():
+                lines.append(f"{category}:")
+                for cmd_name in cmds:
+                    if cmd_name in cls._descriptions:
+                        padding = " " * (max_name - len(cmd_name) + 2)
+                        lines.append(f"  {cmd_name}{padding}- {cls._descriptions[cmd_name]}")
+                lines.append("")
+            lines.append("Type 'help <command>' for more information on a specific command.")
+            cls._help_lines = lines
+
+    def _ensure_commands(self):
+        """Build the dispatch table the first time a command is used."""
+        if self._handlers is None:
+            self.init_custom_commands()
 
     def apply_styling(self):
-        css_provider = Gtk.CssProvider()
-        css = """
-            .terminal-panel {
-                background-color: rgba(0, 10, 30, 0.8);
-                border-radius: 5px;
-                border: 1px solid rgba(0, 191, 255, 0.3);
-            }
-            .terminal-panel-toolbar {
-                background-color: rgba(0, 30, 60, 0.8);
-                border-bottom: 1px solid rgba(0, 191, 255, 0.3);
-            }
-            .tool-button {
-                background-color: rgba(0, 40, 80, 0.7);
-                border-radius: 4px;
-                border: 1px solid rgba(0, 191, 255, 0.5);
-                padding: 2px;
-                transition: all 0.2s ease;
-            }
-            .tool-button:hover {
-                background-color: rgba(0, 70, 130, 0.8);
-                border-color: rgba(0, 255, 255, 0.8);
-            }
-            notebook tab {
-                background-color: rgba(0, 20, 50, 0.7);
-                padding: 2px 8px;
-                border: 1px solid rgba(0, 191, 255, 0.3);
-                color: #00BFFF;
-            }
-            notebook tab:checked {
-                background-color: rgba(0, 40, 90, 0.8);
-                border-bottom: 1px solid #00BFFF;
-            }
-            entry {
-                background-color: rgba(0, 20, 50, 0.8);
-                color: #00BFFF;
-                border: 1px solid rgba(0, 191, 255, 0.5);
-                border-radius: 4px;
-                padding: 4px 8px;
-            }
-            entry:focus {
-                border-color: rgba(0, 255, 255, 0.8);
-            }
-        """
-        css_provider.load_from_data(css.encode())
-        
-        # Apply CSS to the default display - GTK4 style
+        # Install one provider per display; later panels reuse it
         display = Gdk.Display.get_default()
+        if display is None or display in TerminalPanel._css_displays:
+            return
+
+        if TerminalPanel._css_provider is None:
+            TerminalPanel._css_provider = Gtk.CssProvider()
+            TerminalPanel._css_provider.load_from_data(TERMINAL_CSS_BYTES)
+
+        # Apply CSS to the default display - GTK4 style
         Gtk.StyleContext.add_provider_for_display(
             display, 
-            css_provider,
+            TerminalPanel._css_provider,
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
+        TerminalPanel._css_displays.add(display)
 
     def create_tool_button(self, icon_name, tooltip, callback):
         button = Gtk.Button()
@@ -344,40 +495,18 @@ class TerminalPanel:
         page_index = self.notebook.append_page(scrolled, tab_box)
         self.notebook.set_current_page(page_index)
         
-        # Try different spawn methods based on what's available in this VTE version
         try:
-            if hasattr(terminal, 'spawn_async'):
-                terminal.spawn_async(
-                    Vte.PtyFlags.DEFAULT,
-                    os.environ['HOME'],
-                    ["/bin/bash"],
-                    [],
-                    GLib.SpawnFlags.DO_NOT_REAP_CHILD,
-                    None,
-                    None,
-                    -1,
-                    None,
-                    None
-                )
-            else:
-                terminal.spawn_sync(
-                    Vte.PtyFlags.DEFAULT,
-                    os.environ['HOME'],
-                    ["/bin/bash"],
-                    [],
-                    GLib.SpawnFlags.DO_NOT_REAP_CHILD,
-                    None,
-                    None,
-                )
+            self._spawn_shell(terminal)
         except Exception as e:
             print(f"Error spawning terminal: {e}")
             error_label = Gtk.Label()
             error_label.set_markup(f"<span foreground='#ff5555'>Error spawning terminal:\n{e}</span>")
             terminal.set_child(error_label)
 
-        # Connect exit signal
-        if hasattr(terminal, 'connect'):
-            terminal.connect("child-exited", self.on_terminal_exit)
+        # Tabs opened after startup pick up the current font size
+        font_desc = getattr(self, '_font_desc', None)
+        if font_desc is not None:
+            terminal.set_font(font_desc)
 
         self.terminals.append(terminal)
         return terminal
@@ -389,9 +518,11 @@ class TerminalPanel:
         return None
 
     def update_font(self):
+        # Build the description once per size change and share it across tabs
+        self._font_desc = Pango.FontDescription("Monospace")
+        self._font_desc.set_size(self.font_size * Pango.SCALE)
         for terminal in self.terminals:
-            font_desc = Pango.FontDescription(f"Monospace {self.font_size}")
-            terminal.set_font(font_desc)
+            terminal.set_font(self._font_desc)
 
     def on_new_tab(self, button):
         self.create_terminal_tab(f"Terminal {len(self.terminals)}")
@@ -488,14 +619,101 @@ class TerminalPanel:
         else:
             self.cmd_entry.set_text("")
 
+    def _history_index_remove(self, command):
+        """Drop one occurrence of command from the sorted history index."""
+        i = bisect.bisect_left(self._history_sorted, command)
+        if i < len(self._history_sorted) and self._history_sorted[i] == command:
+            del self._history_sorted[i]
+
+    def search_history(self):
+        """Cycle through history entries starting with the typed prefix (Ctrl-R)."""
+        text = self.cmd_entry.get_text()
+        prefix, index, shown = self._history_search
+        hist = self._history_sorted
+
+        # Repeated Ctrl-R continues after the current match; new text starts over
+        if shown is None or text != shown:
+            prefix = text
+            i = bisect.bisect_left(hist, prefix)
+        else:
+            i = index + 1
+            while i < len(hist) and hist[i] == shown:
+                i += 1
+
+        if i >= len(hist) or not hist[i].startswith(prefix):
+            # Wrap around to the first match
+            i = bisect.bisect_left(hist, prefix)
+            if i >= len(hist) or not hist[i].startswith(prefix):
+                return
+
+        self._history_search = (prefix, i, hist[i])
+        self.cmd_entry.set_text(hist[i])
+        self.cmd_entry.set_position(-1)
+
+    def _complete(self, prefix, is_command):
+        """Return completion candidates for prefix, cached briefly per directory."""
+        key = (os.getcwd(), prefix, is_command)
+        now = time.monotonic()
+        cached = self._compl_cache.get(key)
+        if cached is not None and now - cached[0] < COMPLETION_CACHE_TTL:
+            return cached[1]
+
+        matches = []
+        if is_command:
+            self._ensure_commands()
+            matches.extend(name for name in self._handlers if name.startswith(prefix))
+
+        directory, base = os.path.split(prefix)
+        try:
+            with os.scandir(directory or ".") as it:
+                for entry in it:
+                    if entry.name.startswith(base):
+                        suffix = "/" if entry.is_dir() else ""
+                        matches.append(os.path.join(directory, entry.name) + suffix)
+        except OSError:
+            pass
+
+        matches.sort()
+        if len(self._compl_cache) >= 64:
+            self._compl_cache.clear()
+        self._compl_cache[key] = (now, matches)
+        return matches
+
+    def complete_command(self):
+        """Complete the word before the cursor from commands and paths (Tab)."""
+        text = self.cmd_entry.get_text()
+        head, sep, word = text.rpartition(" ")
+        matches = self._complete(word, is_command=not sep)
+        if not matches:
+            return
+
+        completion = os.path.commonprefix(matches)
+        if len(matches) == 1 and not completion.endswith("/"):
+            completion += " "
+        if completion != word:
+            self.cmd_entry.set_text(head + sep + completion)
+            self.cmd_entry.set_position(-1)
+        elif len(matches) > 1:
+            self.write_to_terminal("  ".join(matches) + "\n")
+
     def on_cmd_keypress(self, controller, keyval, keycode, state):
         """Handle key presses in the command entry"""
-        # Handle up/down arrow keys for history navigation
-        if keyval == Gdk.KEY_Up:
-            self.navigate_history("up")
+        if keyval == Gdk.KEY_r and state & Gdk.ModifierType.CONTROL_MASK:
+            self.search_history()
             return True
-        elif keyval == Gdk.KEY_Down:
-            self.navigate_history("down")
+
+        if keyval == Gdk.KEY_Tab:
+            self.complete_command()
+            return True
+
+        # Handle up/down arrow keys for history navigation
+        if keyval in (Gdk.KEY_Up, Gdk.KEY_Down):
+            # Swallow key auto-repeat so holding the key steps at most every 50 ms
+            now = GLib.get_monotonic_time() // 1000
+            if now - self._last_hist_key_ts < HISTORY_KEY_DEBOUNCE_MS:
+                return True
+            self._last_hist_key_ts = now
+            self.navigate_history("up" if keyval == Gdk.KEY_Up else "down")
             return True
         return False
 
@@ -510,9 +728,13 @@ class TerminalPanel:
         if not command_text:
             return
 
-        # Add command to history
+        # Add command to history, keeping the sorted index in step
+        if len(self.command_history) == self.command_history.maxlen:
+            self._history_index_remove(self.command_history[0])
         self.command_history.append(command_text)
+        bisect.insort(self._history_sorted, command_text)
         self.history_position = len(self.command_history)
+        self._history_search = ("", -1, None)
 
         # Clear the command entry
         self.cmd_entry.set_text("")
@@ -523,9 +745,11 @@ class TerminalPanel:
         args = cmd_parts[1:] if len(cmd_parts) > 1 else []
 
         # Check if it's a custom command
-        if cmd in self.custom_commands:
+        self._ensure_commands()
+        handler = self._handlers.get(cmd)
+        if handler is not None:
             self.write_to_terminal(f"> {command_text}\n")
-            self.custom_commands[cmd]["handler"](args)
+            handler(args)
             return
 
         # If VTE is not available, show a message for system commands
@@ -541,60 +765,115 @@ class TerminalPanel:
 
     def write_to_terminal(self, text):
         """Write text directly to the current terminal."""
+        self.feed_bytes(text.encode())
+
+    def feed_bytes(self, data):
+        """Write already-encoded bytes to the current terminal's display."""
         term = self.get_current_terminal()
         if term:
-            # Use feed_child instead of feed for compatibility with different Vte versions
-            term.feed_child(text.encode())
+            # feed() renders to the screen; feed_child() would type the bytes
+            # into the shell. The display needs CRLF to return to column 0.
+            term.feed(data.replace(b'\n', b'\r\n'))
+
+    def _spawn_async(self, argv, callback=None):
+        """Run an external command without blocking the main loop.
+
+        Gio.Subprocess is created with no working directory or child setup so
+        GLib can use posix_spawn() instead of fork(). When the command finishes,
+        its output is written to the terminal, or passed to callback(stdout,
+        stderr) if one is given.
+        """
+        try:
+            proc = Gio.Subprocess.new(
+                argv, Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_PIPE)
+        except GLib.Error as e:
+            self.write_to_terminal(f"Error: {e.message}\n")
+            return
+
+        def on_finished(proc, result):
+            try:
+                _, stdout, stderr = proc.communicate_utf8_finish(result)
+            except GLib.Error as e:
+                self.write_to_terminal(f"Error: {e.message}\n")
+                return
+            if callback:
+                callback(stdout or "", stderr or "")
+                return
+            self.write_to_terminal((stdout or "") + (stderr or ""))
+
+        proc.communicate_utf8_async(None, None, on_finished)
+
+    def write_block(self, lines):
+        """Write several lines to the current terminal with a single feed."""
+        self.write_to_terminal("\n".join(lines) + "\n")
 
     def ensure_terminal_focus(self):
         term = self.get_current_terminal()
         if term:
             term.grab_focus()
 
-    def on_terminal_exit(self, terminal, status):
-        terminal.spawn_sync(
+    def _spawn_shell(self, terminal):
+        """Start a shell in the terminal without blocking the main loop."""
+        terminal.spawn_async(
             Vte.PtyFlags.DEFAULT,
             os.environ['HOME'],
-            ["/bin/bash"],
+            SHELL_ARGV,
             [],
-            GLib.SpawnFlags.DO_NOT_REAP_CHILD,
+            GLib.SpawnFlags.DEFAULT,
+            None,
             None,
+            -1,
             None,
+            self._on_shell_spawned,
+            None
         )
 
+    def _on_shell_spawned(self, terminal, pid, error, user_data=None):
+        """Watch the new shell for exit via a pidfd, falling back to child-exited."""
+        if error is not None or pid <= 0:
+            print(f"Error spawning terminal: {error.message if error else pid}")
+            return
+        try:
+            pidfd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            # Python < 3.9 or kernel < 5.3
+            self._watch_child_exited(terminal)
+            return
+        GLib.unix_fd_add_full(GLib.PRIORITY_DEFAULT, pidfd, GLib.IOCondition.IN,
+                              self._on_pidfd_ready, terminal)
+
+    def _watch_child_exited(self, terminal):
+        """Respawn the shell from VTE's child-exited signal (connected once)."""
+        if terminal not in self._exit_watched:
+            self._exit_watched.add(terminal)
+            terminal.connect("child-exited", self.on_terminal_exit)
+
+    def _on_pidfd_ready(self, pidfd, condition, terminal):
+        """The shell's pidfd became readable, meaning the process exited."""
+        os.close(pidfd)
+        self.on_terminal_exit(terminal, 0)
+        return False
+
+    def on_terminal_exit(self, terminal, status):
+        # Don't respawn into a tab that has been closed
+        if terminal not in self.terminals:
+            return
+        self._spawn_shell(terminal)
+
     # Custom command handlers
     def cmd_help(self, args):
         """Show help for available commands."""
+        self._ensure_commands()
         if args:
             cmd_name = args[0]
-            if cmd_name in self.custom_commands:
-                cmd = self.custom_commands[cmd_name]
-                self.write_to_terminal(f"{cmd_name} - {cmd['description']}\n")
+            description = self._descriptions.get(cmd_name)
+            if description is not None:
+                self.write_to_terminal(f"{cmd_name} - {description}\n")
             else:
                 self.write_to_terminal(f"Unknown command: {cmd_name}\n")
             return
 
-        # Group commands by category
-        categories = {
-            "File System": ["ls", "cat", "rm", "pwd", "cd", "mkdir", "write"],
-            "System Info": ["meminfo", "ps", "kill", "diag"],
-            "Shell": ["help", "clear", "echo", "history", "version", "exit", "sleep"]
-        }
-        
-        # Find the max command name length for pretty formatting
-        max_name_len = max(len(name) for name in self.custom_commands.keys())
-        
-        self.write_to_terminal("Available commands:\n\n")
-        
-        for category, cmds in categories.items():
-            self.write_to_terminal(f"{category}:\n")
-            for cmd_name in cmds:
-                if cmd_name in self.custom_commands:
-                    padding = " " * (max_name_len - len(cmd_name) + 2)
-                    self.write_to_terminal(f"  {cmd_name}{padding}- {self.custom_commands[cmd_name]['description']}\n")
-            self.write_to_terminal("\n")
-            
-        self.write_to_terminal("Type 'help <command>' for more information on a specific command.\n")
+        self.write_block(self._help_lines)
 
     def cmd_clear(self, args):
         """Clear the terminal screen."""
@@ -609,36 +888,97 @@ class TerminalPanel:
     def cmd_history(self, args):
         """Show command history."""
         if not self.command_history:
-            self.write_to_terminal("No command history\n")
+            self.feed_bytes(NO_HISTORY_BYTES)
             return
             
-        self.write_to_terminal("Command History:\n")
-        for i, cmd in enumerate(self.command_history):
-            self.write_to_terminal(f"{i+1}: {cmd}\n")
+        lines = ["Command History:"]
+        lines.extend(f"{i+1}: {cmd}" for i, cmd in enumerate(self.command_history))
+        self.write_block(lines)
     
     def cmd_version(self, args):
         """Show system version."""
-        self.write_to_terminal("Hextrix OS HUD Terminal v1.0.0\n")
-        self.write_to_terminal(f"Running on {platform.system()} {platform.release()}\n")
-        self.write_to_terminal("Enhanced Shell with command history and tab completion\n")
+        self.feed_bytes(VERSION_BYTES + PLATFORM_BYTES + SHELL_FEATURES_BYTES)
     
     def cmd_exit(self, args):
         """Exit the shell."""
-        self.write_to_terminal("Exiting shell...\n")
+        self.feed_bytes(EXITING_BYTES)
         term = self.get_current_terminal()
         if term:
             term.reset(True, True)
     
     def cmd_ls(self, args):
         """List files in directory."""
+        # Options aren't handled in-process; hand those off to the real ls
+        if any(arg.startswith("-") for arg in args):
+            self._spawn_async(["ls", *args])
+            return
+
+        target_dir = args[0] if args else "."
         try:
-            target_dir = args[0] if args else "."
-            output = subprocess.check_output(["ls", "-la", target_dir], universal_newlines=True)
-            self.write_to_terminal(output)
-        except subprocess.CalledProcessError as e:
-            self.write_to_terminal(f"Error: {e.stderr if e.stderr else e}\n")
+            with os.scandir(target_dir) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
         except FileNotFoundError:
             self.write_to_terminal(f"Error: Directory not found\n")
+            return
+        except NotADirectoryError:
+            self.write_to_terminal(f"'{target_dir}' is not a directory\n")
+            return
+        except PermissionError:
+            self.write_to_terminal(f"Permission denied: '{target_dir}'\n")
+            return
+
+        # Format in-process instead of forking ls, in the same layout as ls -la
+        rows = []
+        blocks = 0
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            blocks += getattr(st, 'st_blocks', 0)
+            name = entry.name
+            if stat.S_ISLNK(st.st_mode):
+                try:
+                    name = f"{name} -> {os.readlink(entry.path)}"
+                except OSError:
+                    pass
+            rows.append((stat.filemode(st.st_mode), str(st.st_nlink),
+                         self._owner_name(st.st_uid), self._group_name(st.st_gid),
+                         str(st.st_size), time.strftime("%b %d %H:%M", time.localtime(st.st_mtime)),
+                         name))
+
+        # Right-align counts/sizes and left-align names like ls does
+        widths = [max((len(row[i]) for row in rows), default=0) for i in range(5)]
+        lines = [f"total {blocks // 2}"]
+        for mode, nlink, owner, group, size, mtime, name in rows:
+            lines.append(f"{mode} {nlink:>{widths[1]}} {owner:<{widths[2]}} {group:<{widths[3]}} "
+                         f"{size:>{widths[4]}} {mtime} {name}")
+        self.write_to_terminal("\n".join(lines) + "\n")
+
+    _owner_cache = {}
+    _group_cache = {}
+
+    def _owner_name(self, uid):
+        """Resolve a uid to a user name, memoized."""
+        name = self._owner_cache.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name if pwd else str(uid)
+            except KeyError:
+                name = str(uid)
+            self._owner_cache[uid] = name
+        return name
+
+    def _group_name(self, gid):
+        """Resolve a gid to a group name, memoized."""
+        name = self._group_cache.get(gid)
+        if name is None:
+            try:
+                name = grp.getgrgid(gid).gr_name if grp else str(gid)
+            except KeyError:
+                name = str(gid)
+            self._group_cache[gid] = name
+        return name
     
     def cmd_cat(self, args):
         """Display file contents."""
@@ -647,19 +987,44 @@ class TerminalPanel:
             return
             
         try:
-            with open(args[0], 'r') as f:
-                content = f.read()
-                self.write_to_terminal(content)
-                if not content.endswith('\n'):
-                    self.write_to_terminal('\n')
+            fd = os.open(args[0], os.O_RDONLY)
         except FileNotFoundError:
             self.write_to_terminal(f"File '{args[0]}' not found\n")
+            return
         except IsADirectoryError:
             self.write_to_terminal(f"'{args[0]}' is a directory\n")
+            return
         except PermissionError:
             self.write_to_terminal(f"Permission denied: '{args[0]}'\n")
+            return
         except Exception as e:
             self.write_to_terminal(f"Error: {str(e)}\n")
+            return
+
+        # Stream raw bytes one chunk per main loop iteration so large files
+        # neither sit in memory whole nor block the UI
+        last_byte = [b'\n']
+
+        def feed_next_chunk():
+            try:
+                chunk = os.read(fd, CAT_CHUNK_SIZE)
+            except IsADirectoryError:
+                self.write_to_terminal(f"'{args[0]}' is a directory\n")
+                chunk = None
+            except Exception as e:
+                self.write_to_terminal(f"Error: {str(e)}\n")
+                chunk = None
+            if chunk:
+                self.feed_bytes(chunk)
+                last_byte[0] = chunk[-1:]
+                return True
+            os.close(fd)
+            if chunk is not None and last_byte[0] != b'\n':
+                self.feed_bytes(b'\n')
+            return False
+
+        if feed_next_chunk():
+            GLib.idle_add(feed_next_chunk)
     
     def cmd_rm(self, args):
         """Delete a file."""
@@ -689,6 +1054,7 @@ class TerminalPanel:
         
         try:
             os.chdir(target_dir)
+            self._compl_cache.clear()
             self.write_to_terminal(f"{os.getcwd()}\n")
         except FileNotFoundError:
             self.write_to_terminal(f"Directory '{target_dir}' not found\n")
@@ -728,30 +1094,64 @@ class TerminalPanel:
             editor = os.environ.get('EDITOR', 'nano')
             cmd = f"{editor} {args[0]}\n"
             term.feed_child(cmd.encode())
+        else:
+            # No shell to run it in; start a graphical editor directly
+            editor = os.environ.get('VISUAL', 'xdg-open')
+            self._spawn_async([editor, args[0]], lambda stdout, stderr: None)
     
     def cmd_meminfo(self, args):
         """Display memory usage."""
-        mem = psutil.virtual_memory()
-        swap = psutil.swap_memory()
-        
-        self.write_to_terminal("Memory usage:\n")
-        self.write_to_terminal(f"  Total: {mem.total} bytes ({mem.total // (1024*1024)} MB)\n")
-        self.write_to_terminal(f"  Used:  {mem.used} bytes ({mem.used // (1024*1024)} MB, {mem.percent}%)\n")
-        self.write_to_terminal(f"  Free:  {mem.available} bytes ({mem.available // (1024*1024)} MB, {100 - mem.percent}%)\n")
+        # One read of /proc/meminfo instead of psutil's extra syscalls
+        try:
+            with open('/proc/meminfo', 'rb') as f:
+                info = {k: int(v) * 1024 for k, v in _MEM_RE.findall(f.read())}
+            total = info[b'MemTotal']
+            available = info.get(b'MemAvailable', info.get(b'MemFree', 0))
+            swap_total = info.get(b'SwapTotal', 0)
+            swap_used = swap_total - info.get(b'SwapFree', 0)
+        except (OSError, KeyError):
+            mem = psutil.virtual_memory()
+            swap = psutil.swap_memory()
+            total, available = mem.total, mem.available
+            swap_total, swap_used = swap.total, swap.used
+
+        used = total - available
+        mem_percent = round(used * 100 / total, 1) if total else 0.0
+        swap_percent = round(swap_used * 100 / swap_total, 1) if swap_total else 0.0
         
-        self.write_to_terminal("\nSwap Memory:\n")
-        self.write_to_terminal(f"  Total: {swap.total} bytes ({swap.total // (1024*1024)} MB)\n")
-        self.write_to_terminal(f"  Used:  {swap.used} bytes ({swap.used // (1024*1024)} MB, {swap.percent}%)\n")
+        self.write_block([
+            "Memory usage:",
+            f"  Total: {total} bytes ({total // (1024*1024)} MB)",
+            f"  Used:  {used} bytes ({used // (1024*1024)} MB, {mem_percent}%)",
+            f"  Free:  {available} bytes ({available // (1024*1024)} MB, {round(100 - mem_percent, 1)}%)",
+            "",
+            "Swap Memory:",
+            f"  Total: {swap_total} bytes ({swap_total // (1024*1024)} MB)",
+            f"  Used:  {swap_used} bytes ({swap_used // (1024*1024)} MB, {swap_percent}%)",
+        ])
     
     def cmd_ps(self, args):
         """List running processes."""
-        self.write_to_terminal("PID\tCPU%\tMEM%\tNAME\n")
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                info = proc.info
-                self.write_to_terminal(f"{info['pid']}\t{info['cpu_percent']:.1f}\t{info['memory_percent']:.1f}\t{info['name']}\n")
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        # Repeated invocations within the TTL reuse the last listing
+        now = time.monotonic()
+        cached_at, text = self._ps_cache
+        if now - cached_at < PS_CACHE_TTL:
+            self.write_to_terminal(text)
+            return
+
+        # Walking /proc takes tens of ms; collect on a worker thread and
+        # hand the text back to the main loop
+        def worker():
+            text = _collect_ps()
+            GLib.idle_add(self._on_ps_collected, text)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_ps_collected(self, text):
+        """Cache and print a ps listing produced by the worker thread."""
+        self._ps_cache = (time.monotonic(), text)
+        self.write_to_terminal(text)
+        return False
     
     def cmd_kill(self, args):
         """Terminate a process."""
@@ -785,6 +1185,9 @@ class TerminalPanel:
             
         try:
             ms = int(args[0])
+            if ms < 0:
+                self.write_to_terminal("Invalid time format\n")
+                return
             self.write_to_terminal(f"Sleeping for {ms} ms...\n")
             
             # Use GLib timeout for non-blocking sleep
@@ -800,41 +1203,9 @@ class TerminalPanel:
         """Run system diagnostics."""
         self.write_to_terminal("Running system diagnostics...\n")
         
-        # System information
-        self.write_to_terminal("\n=== System Information ===\n")
-        self.write_to_terminal(f"System: {platform.system()} {platform.release()}\n")
-        self.write_to_terminal(f"Version: {platform.version()}\n")
-        self.write_to_terminal(f"Machine: {platform.machine()}\n")
-        self.write_to_terminal(f"Processor: {platform.processor()}\n")
-        
-        # Memory information
-        self.write_to_terminal("\n=== Memory Information ===\n")
-        mem = psutil.virtual_memory()
-        self.write_to_terminal(f"Memory: {mem.total // (1024*1024)} MB total, "
-                              f"{mem.used // (1024*1024)} MB used, "
-                              f"{mem.available // (1024*1024)} MB free\n")
-        
-        # Disk information
-        self.write_to_terminal("\n=== Disk Information ===\n")
-        for part in psutil.disk_partitions():
-            try:
-                usage = psutil.disk_usage(part.mountpoint)
-                self.write_to_terminal(f"Partition: {part.device} mounted at {part.mountpoint}\n")
-                self.write_to_terminal(f"  Type: {part.fstype}\n")
-                self.write_to_terminal(f"  Total: {usage.total // (1024*1024)} MB\n")
-                self.write_to_terminal(f"  Used: {usage.used // (1024*1024)} MB ({usage.percent}%)\n")
-                self.write_to_terminal(f"  Free: {usage.free // (1024*1024)} MB\n")
-            except PermissionError:
-                self.write_to_terminal(f"Partition: {part.device} mounted at {part.mountpoint} (Permission denied)\n")
-        
-        # Network information
-        self.write_to_terminal("\n=== Network Information ===\n")
-        try:
-            for name, stats in psutil.net_io_counters(pernic=True).items():
-                self.write_to_terminal(f"Interface: {name}\n")
-                self.write_to_terminal(f"  Bytes sent: {stats.bytes_sent}\n")
-                self.write_to_terminal(f"  Bytes received: {stats.bytes_recv}\n")
-        except Exception as e:
-            self.write_to_terminal(f"Error retrieving network info: {str(e)}\n")
+        # statvfs on slow or network mounts can block for seconds; build the
+        # report on a worker thread and write it from the main loop
+        def worker():
+            GLib.idle_add(self.write_to_terminal, _run_diag_worker())
         
-        self.write_to_terminal("\nDiagnostics completed.\n")
\ No newline at end of file
+        threading.Thread(target=worker, daemon=True).start()
\ No newline at end of file
@@ -1,4 +1,5 @@
 import gi
+import gzip
 import os
 import sys
 from pathlib import Path
@@ -15,9 +16,113 @@ from gi.repository import Gtk
 if WEBKIT_AVAILABLE:
     from gi.repository import WebKit
 
+# Fallback page used when assets/neural_vis/index.html is missing; only the
+# compressed bytes are kept in memory
+_INLINE_VIS_HTML_GZ = gzip.compress(b"""\
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body, html {
+            margin: 0;
+            padding: 0;
+            width: 100%;
+            height: 100%;
+            overflow: hidden;
+            background-color: rgba(0, 0, 0, 0);
+        }
+        canvas {
+            display: block;
+            width: 100%;
+            height: 100%;
+        }
+    </style>
+</head>
+<body>
+    <canvas id="canvas"></canvas>
+    <script>
+        const canvas = document.getElementById('canvas');
+        const ctx = canvas.getContext('2d');
+
+        // Set canvas dimensions
+        canvas.width = window.innerWidth;
+        canvas.height = window.innerHeight;
+
+        // Node directions are fixed; compute their cos/sin once
+        const NODE_COUNT = 30;
+        const NODE_COS = new Float32Array(NODE_COUNT);
+        const NODE_SIN = new Float32Array(NODE_COUNT);
+        for (let i = 0; i < NODE_COUNT; i++) {
+            const angle = (i / NODE_COUNT) * Math.PI * 2;
+            NODE_COS[i] = Math.cos(angle);
+            NODE_SIN[i] = Math.sin(angle);
+        }
+
+        // Animation parameters
+        let animationFrame;
+        let time = 0;
+
+        // Draw function
+        function draw() {
+            // Clear with transparent background
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+            // Draw neural network visualization
+            const centerX = canvas.width / 2;
+            const centerY = canvas.height / 2;
+
+            // Draw pulsing nodes
+            for (let i = 0; i < NODE_COUNT; i++) {
+                const radius = 100 + Math.sin(time + i * 0.2) * 20;
+                const x = centerX + NODE_COS[i] * radius;
+                const y = centerY + NODE_SIN[i] * radius;
+
+                // Pulsing effect
+                const pulse = Math.sin(time + i * 0.3) * 0.5 + 0.5;
+
+                // Glow
+                const gradient = ctx.createRadialGradient(x, y, 0, x, y, 15);
+                gradient.addColorStop(0, `rgba(0, 191, 255, ${0.8 * pulse})`);
+                gradient.addColorStop(1, 'rgba(0, 0, 0, 0)');
+
+                ctx.beginPath();
+                ctx.arc(x, y, 15, 0, Math.PI * 2);
+                ctx.fillStyle = gradient;
+                ctx.fill();
+
+                // Node
+                ctx.beginPath();
+                ctx.arc(x, y, 3 + pulse * 2, 0, Math.PI * 2);
+                ctx.fillStyle = `rgba(255, 255, 255, ${0.7 + 0.3 * pulse})`;
+                ctx.fill();
+            }
+
+            // Update time
+            time += 0.02;
+
+            // Repeat
+            animationFrame = requestAnimationFrame(draw);
+        }
+
+        // Handle resize
+        window.addEventListener('resize', () => {
+            canvas.width = window.innerWidth;
+            canvas.height = window.innerHeight;
+        });
+
+        // Start animation
+        draw();
+    </script>
+</body>
+</html>
+""", 9)
+
 class WebNeuralVisualization(Gtk.Box):
     """Web-based Neural Network Visualization"""
     
+    # Whether assets/neural_vis/index.html exists; stat'ed by the first instance
+    _html_found = None
+    
     def __init__(self):
         """Initialize the visualization widget"""
         super().__init__(orientation=Gtk.Orientation.VERTICAL)
@@ -27,16 +132,21 @@ class WebNeuralVisualization(Gtk.Box):
         project_dir = os.path.dirname(script_dir)
         self.html_path = os.path.join(project_dir, "assets", "neural_vis", "index.html")
         
-        # Check if the HTML file exists, create directory if needed
-        html_dir = os.path.dirname(self.html_path)
-        if not os.path.exists(html_dir):
-            os.makedirs(html_dir, exist_ok=True)
+        # Create the directory if needed and check for the HTML file once
+        # per process; neither changes while the HUD runs
+        if WebNeuralVisualization._html_found is None:
+            os.makedirs(os.path.dirname(self.html_path), exist_ok=True)
+            try:
+                os.stat(self.html_path)
+                WebNeuralVisualization._html_found = True
+            except FileNotFoundError:
+                WebNeuralVisualization._html_found = False
         
         if WEBKIT_AVAILABLE:
             self.webview = WebKit.WebView()
             self.webview.set_background_color(Gdk.RGBA(0, 0, 0, 0))
             
-            if os.path.exists(self.html_path):
+            if WebNeuralVisualization._html_found:
                 file_uri = "file://" + self.html_path
                 self.webview.load_uri(file_uri)
             else:
@@ -55,96 +165,7 @@ class WebNeuralVisualization(Gtk.Box):
     
     def _create_inline_visualization(self):
         """Create a basic visualization using inline HTML when the file doesn't exist"""
-        # Basic HTML with canvas visualization
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body, html {
-                    margin: 0;
-                    padding: 0;
-                    width: 100%;
-                    height: 100%;
-                    overflow: hidden;
-                    background-color: rgba(0, 0, 0, 0);
-                }
-                canvas {
-                    display: block;
-                    width: 100%;
-                    height: 100%;
-                }
-            </style>
-        </head>
-        <body>
-            <canvas id="canvas"></canvas>
-            <script>
-                const canvas = document.getElementById('canvas');
-                const ctx = canvas.getContext('2d');
-                
-                // Set canvas dimensions
-                canvas.width = window.innerWidth;
-                canvas.height = window.innerHeight;
-                
-                // Animation parameters
-                let animationFrame;
-                let time = 0;
-                
-                // Draw function
-                function draw() {
-                    // Clear with transparent background
-                    ctx.clearRect(0, 0, canvas.width, canvas.height);
-                    
-                    // Draw neural network visualization
-                    const centerX = canvas.width / 2;
-                    const centerY = canvas.height / 2;
-                    
-                    // Draw pulsing nodes
-                    for (let i = 0; i < 30; i++) {
-                        const angle = (i / 30) * Math.PI * 2;
-                        const radius = 100 + Math.sin(time + i * 0.2) * 20;
-                        const x = centerX + Math.cos(angle) * radius;
-                        const y = centerY + Math.sin(angle) * radius;
-                        
-                        // Pulsing effect
-                        const pulse = Math.sin(time + i * 0.3) * 0.5 + 0.5;
-                        
-                        // Glow
-                        const gradient = ctx.createRadialGradient(x, y, 0, x, y, 15);
-                        gradient.addColorStop(0, `rgba(0, 191, 255, ${0.8 * pulse})`);
-                        gradient.addColorStop(1, 'rgba(0, 0, 0, 0)');
-                        
-                        ctx.beginPath();
-                        ctx.arc(x, y, 15, 0, Math.PI * 2);
-                        ctx.fillStyle = gradient;
-                        ctx.fill();
-                        
-                        // Node
-                        ctx.beginPath();
-                        ctx.arc(x, y, 3 + pulse * 2, 0, Math.PI * 2);
-                        ctx.fillStyle = `rgba(255, 255, 255, ${0.7 + 0.3 * pulse})`;
-                        ctx.fill();
-                    }
-                    
-                    // Update time
-                    time += 0.02;
-                    
-                    // Repeat
-                    animationFrame = requestAnimationFrame(draw);
-                }
-                
-                // Handle resize
-                window.addEventListener('resize', () => {
-                    canvas.width = window.innerWidth;
-                    canvas.height = window.innerHeight;
-                });
-                
-                // Start animation
-                draw();
-            </script>
-        </body>
-        </html>
-        """
+        html = gzip.decompress(_INLINE_VIS_HTML_GZ).decode()
         self.webview.load_html(html, "file:///")
 
 # Main function for testing the widget independently
@@ -1,13 +1,54 @@
 #!/usr/bin/env python3
 
 from PIL import Image, ImageDraw
+from PIL.PngImagePlugin import PngInfo
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import hashlib
 import os
 
+def _hash_code(h, code):
+    """Feed bytecode, constants and names of ``code`` (and nested code) into ``h``."""
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(h, const)
+        else:
+            h.update(repr(const).encode())
+
+def icon_fingerprint(size, draw_func):
+    """Identify an icon by its draw function (name, bytecode, constants) and size."""
+    h = hashlib.blake2b(f"{draw_func.__name__}:{size}:".encode(), digest_size=8)
+    _hash_code(h, draw_func.__code__)
+    return h.hexdigest()
+
+def icon_is_current(name, fingerprint):
+    """True if ``name`` exists and was written with ``fingerprint``."""
+    try:
+        with Image.open(name) as img:
+            return img.info.get("fp") == fingerprint
+    except OSError:
+        return False
+
+# One reusable (Image, ImageDraw) canvas per icon size in this process
+_canvases = {}
+
+def _canvas(size):
+    canvas = _canvases.get(size)
+    if canvas is None:
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        canvas = _canvases[size] = (img, ImageDraw.Draw(img))
+    else:
+        canvas[0].paste((0, 0, 0, 0), (0, 0, size, size))
+    return canvas
+
 def create_icon(name, size, draw_func):
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = _canvas(size)
     draw_func(draw, size)
-    img.save(name)
+    info = PngInfo()
+    info.add_text("fp", icon_fingerprint(size, draw_func))
+    img.save(name, pnginfo=info)
 
 def draw_vline(draw, size):
     color = (0, 255, 255, 255)  # Cyan
@@ -48,8 +89,18 @@ def draw_branch_open(draw, size):
     ]
     draw.polygon(points, outline=color, fill=None, width=2)
 
+ICON_SIZE = 16
+
+def _worker(item):
+    name, draw_func = item
+    create_icon(name, ICON_SIZE, draw_func)
+    return name
+
 def main():
-    size = 16
+    parser = argparse.ArgumentParser(description="Generate tree view icons")
+    parser.add_argument('--verbose', action='store_true', help="print each icon as it is written")
+    args = parser.parse_args()
+
     icons = {
         'vline.png': draw_vline,
         'branch-more.png': draw_branch_more,
@@ -58,9 +109,18 @@ def main():
         'branch-open.png': draw_branch_open
     }
     
-    for name, draw_func in icons.items():
-        create_icon(name, size, draw_func)
-        print(f"Created {name}")
+    # Only the PNG header is read to skip icons that are already up to date
+    stale = {name: draw_func for name, draw_func in icons.items()
+             if not icon_is_current(name, icon_fingerprint(ICON_SIZE, draw_func))}
+    if not stale:
+        return
+    icons = stale
+    
+    # Each icon is independent; render and save them in parallel
+    with ProcessPoolExecutor(max_workers=min(len(icons), os.cpu_count() or 1)) as ex:
+        for name in ex.map(_worker, icons.items()):
+            if args.verbose:
+                print(f"Created {name}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,59 +1,191 @@
 # kinect_processor.py
-import cv2
+import os
+import sys
+import threading
+import time
 import numpy as np
 from simple_point_cloud import PointCloud
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional AVX2 back-projection kernel built from kinect_project.c
+_NATIVE_LIB = "kinect_project.dll" if os.name == 'nt' else "libkinect_project.so"
+try:
+    import ctypes
+    _native = ctypes.CDLL(os.path.join(os.path.dirname(os.path.abspath(__file__)), _NATIVE_LIB))
+    _native.project.restype = ctypes.c_int
+    _native.project.argtypes = [
+        np.ctypeslib.ndpointer(np.uint16, ndim=2, flags='C_CONTIGUOUS'),
+        ctypes.c_int, ctypes.c_int,
+        np.ctypeslib.ndpointer(np.float32, ndim=1, flags='C_CONTIGUOUS'),
+        np.ctypeslib.ndpointer(np.float32, ndim=1, flags='C_CONTIGUOUS'),
+        ctypes.c_float, ctypes.c_float,
+        np.ctypeslib.ndpointer(np.float32, ndim=2, flags='C_CONTIGUOUS'),
+        np.ctypeslib.ndpointer(np.int32, ndim=1, flags='C_CONTIGUOUS'),
+    ]
+    NATIVE_AVAILABLE = True
+except (OSError, AttributeError):
+    _native = None
+    NATIVE_AVAILABLE = False
+
+# Back-off between failed camera reads, and how many failures in a row
+# (unplugged camera, end of stream) end a capture thread
+_READ_RETRY_DELAY = 0.05
+_MAX_READ_FAILURES = 100
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _row_offsets(depth, max_depth_raw):
+        """Prefix sum of valid pixel counts per row; offsets[h] is the total."""
+        height, width = depth.shape
+        offsets = np.zeros(height + 1, dtype=np.int64)
+        for y in prange(height):
+            n = 0
+            for x in range(width):
+                d = depth[y, x]
+                if d > 0 and d < max_depth_raw:
+                    n += 1
+            offsets[y + 1] = n
+        for y in range(height):
+            offsets[y + 1] += offsets[y]
+        return offsets
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _project(depth, ray_x, ray_y, depth_scale, max_depth_raw, offsets, out_xyz):
+        """Back-project valid depth pixels into out_xyz, one row per thread."""
+        height, width = depth.shape
+        for y in prange(height):
+            i = offsets[y]
+            for x in range(width):
+                d = depth[y, x]
+                if d == 0 or d >= max_depth_raw:
+                    continue
+                z = d / depth_scale
+                out_xyz[i, 0] = ray_x[x] * z
+                out_xyz[i, 1] = ray_y[y] * z
+                out_xyz[i, 2] = z
+                i += 1
+
+    @njit(parallel=True, cache=True)
+    def _gather_colors(depth, color, max_depth_raw, offsets, out_rgb):
+        """Copy the color of every valid depth pixel, in _project's order."""
+        height, width = depth.shape
+        for y in prange(height):
+            i = offsets[y]
+            for x in range(width):
+                d = depth[y, x]
+                if d == 0 or d >= max_depth_raw:
+                    continue
+                for c in range(3):
+                    out_rgb[i, c] = color[y, x, c]
+                i += 1
+
+
 class KinectProcessor:
     def __init__(self):
         """Initialize the Kinect processor."""
         self.color_capture = None
         self.depth_capture = None
         
+        # Latest frames published by the capture threads (newest wins)
+        self._latest_color = None
+        self._latest_depth = None
+        self._running = False
+        # (capture, thread) pairs, so each device is released only after
+        # the thread reading it has exited
+        self._capture_threads = []
+        
+        # (height, width, intrinsics) -> per-column/per-row unit rays
+        self._rays_cache = {}
+        
+        # Frame-sized point buffer and the PointCloud handed out on every
+        # frame; both are rewritten in place instead of reallocated
+        self._points_buf = None
+        self._index_buf = None
+        self._pc = None
+        
+        # Project on the GPU when CuPy and a CUDA device are available
+        self._cp = None
+        self._use_cuda = False
+        try:
+            import cupy as cp
+            if cp.cuda.runtime.getDeviceCount() > 0:
+                self._cp = cp
+                self._use_cuda = True
+                self._cuda_stream = cp.cuda.Stream(non_blocking=True)
+                self._gpu_rays = (None, None)
+                self._pinned_depth = None
+        except Exception:
+            pass
+        
         # Camera parameters (these will need calibration for accurate results)
-        self.fx = 525.0  # focal length x
-        self.fy = 525.0  # focal length y
-        self.cx = 319.5  # optical center x
-        self.cy = 239.5  # optical center y
+        # Kept as float32 so back-projection math stays single precision
+        self.fx = np.float32(525.0)  # focal length x
+        self.fy = np.float32(525.0)  # focal length y
+        self.cx = np.float32(319.5)  # optical center x
+        self.cy = np.float32(239.5)  # optical center y
         
     def initialize_cameras(self, color_index=0, depth_index=1, max_attempts=3):
         """Initialize color and depth cameras with retry logic."""
+        # OpenCV is only needed once cameras are opened; importing it lazily
+        # keeps it out of processes that only use the point cloud code
+        from cv2 import CAP_PROP_FRAME_WIDTH, CAP_PROP_FRAME_HEIGHT
+        
         try:
             # Try to release any previously initialized cameras
             self.release()
             
+            # A missing device node won't appear by retrying; fail fast
+            # instead of waiting out OpenCV's v4l2 open timeout
+            for index in (color_index, depth_index):
+                if not self._device_present(index):
+                    print(f"Camera device /dev/video{index} not found")
+                    return False
+            
             # Add retry mechanism
             for attempt in range(max_attempts):
+                # Transient USB enumeration failures usually clear quickly;
+                # back off 50 ms, 100 ms, 200 ms, ...
+                delay = 0.05 * (2 ** attempt)
                 try:
-                    self.color_capture = cv2.VideoCapture(color_index)
-                    self.depth_capture = cv2.VideoCapture(depth_index)
+                    self.color_capture = self._open_capture(color_index)
+                    self.depth_capture = self._open_capture(depth_index)
                     
                     # Try to set high resolution
-                    self.color_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-                    self.color_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+                    self.color_capture.set(CAP_PROP_FRAME_WIDTH, 1280)
+                    self.color_capture.set(CAP_PROP_FRAME_HEIGHT, 720)
                     
                     # Read a test frame to verify camera works
-                    ret_color, _ = self.color_capture.read()
-                    ret_depth, _ = self.depth_capture.read()
+                    ret_color, color_frame = self.color_capture.read()
+                    ret_depth, depth_frame = self.depth_capture.read()
                     
                     if not ret_color or not ret_depth:
                         print(f"Failed to read test frames from cameras (attempt {attempt+1}/{max_attempts})")
                         self.release()
                         if attempt < max_attempts - 1:
-                            print(f"Retrying in 2 seconds...")
-                            time.sleep(2)  # Wait before retrying
+                            print(f"Retrying in {delay:.2f} seconds...")
+                            time.sleep(delay)  # Wait before retrying
                             continue
                         else:
                             return False
                     
                     print(f"Successfully initialized cameras on attempt {attempt+1}")
+                    self._latest_color = color_frame
+                    self._latest_depth = depth_frame
+                    self._start_capture_threads()
                     return True
                     
                 except Exception as e:
                     print(f"Error initializing cameras on attempt {attempt+1}: {e}")
                     self.release()
                     if attempt < max_attempts - 1:
-                        print(f"Retrying in 2 seconds...")
-                        time.sleep(2)  # Wait before retrying
+                        print(f"Retrying in {delay:.2f} seconds...")
+                        time.sleep(delay)  # Wait before retrying
                     
             return False
         except Exception as e:
@@ -61,79 +193,260 @@ class KinectProcessor:
             self.release()
             return False
     
+    @staticmethod
+    def _device_present(index):
+        """False only when a Linux camera index has no /dev/video node."""
+        if not sys.platform.startswith('linux') or not isinstance(index, int):
+            return True
+        try:
+            os.stat(f"/dev/video{index}")
+            return True
+        except FileNotFoundError:
+            return False
+    
+    @staticmethod
+    def _open_capture(index):
+        """Open a camera, skipping backend autodetection on Linux."""
+        from cv2 import VideoCapture, CAP_V4L2
+        if sys.platform.startswith('linux') and isinstance(index, int):
+            return VideoCapture(index, CAP_V4L2)
+        return VideoCapture(index)
+    
+    def _start_capture_threads(self):
+        """Read both cameras continuously on daemon threads."""
+        self._running = True
+        self._capture_threads = [
+            (capture, threading.Thread(target=self._capture_loop, args=(capture, slot), daemon=True))
+            for capture, slot in ((self.color_capture, '_latest_color'), (self.depth_capture, '_latest_depth'))
+        ]
+        for _, thread in self._capture_threads:
+            thread.start()
+    
+    def _capture_loop(self, capture, slot):
+        """Keep the newest frame from one camera in a single-slot buffer."""
+        failures = 0
+        while self._running:
+            try:
+                ret, frame = capture.read()
+            except Exception as e:
+                print(f"Error capturing frames: {e}")
+                break
+            if ret:
+                failures = 0
+                # Rebinding an attribute is atomic; readers see old or new
+                setattr(self, slot, frame)
+                continue
+            failures += 1
+            if failures >= _MAX_READ_FAILURES:
+                print(f"Camera stopped delivering frames; giving up after {failures} failed reads")
+                setattr(self, slot, None)
+                break
+            # Don't spin on a dead device and starve the UI thread of the GIL
+            time.sleep(_READ_RETRY_DELAY)
+        if not self._running:
+            # Stopped by release(), which skips devices whose reader was
+            # still blocked in read(); close it now that the read returned
+            capture.release()
+    
     def capture_frames(self):
-        """Capture color and depth frames with error handling."""
-        if not self.color_capture or not self.depth_capture:
+        """Return the latest color and depth frames without blocking."""
+        if not self._running:
             return None, None
         
-        try:
-            # Capture color frame
-            ret_color, color_frame = self.color_capture.read()
-            if not ret_color:
-                return None, None
-                
-            # Capture depth frame
-            ret_depth, depth_frame = self.depth_capture.read()
-            if not ret_depth:
-                return color_frame, None
-                
-            return color_frame, depth_frame
-        except Exception as e:
-            print(f"Error capturing frames: {e}")
+        color_frame = self._latest_color
+        if color_frame is None:
             return None, None
+        return color_frame, self._latest_depth
+    
+    def _unit_rays(self, height, width):
+        """(x - cx) / fx per column and (y - cy) / fy per row, cached per frame size."""
+        key = (height, width, self.fx, self.fy, self.cx, self.cy)
+        rays = self._rays_cache.get(key)
+        if rays is None:
+            ray_x = (np.arange(width, dtype=np.float32) - self.cx) / self.fx
+            ray_y = (np.arange(height, dtype=np.float32) - self.cy) / self.fy
+            rays = self._rays_cache[key] = (ray_x.astype(np.float32), ray_y.astype(np.float32))
+        return rays
+    
+    def _point_buffer(self, height, width):
+        """Float32 buffer with room for every pixel of a frame, reused across frames."""
+        buf = self._points_buf
+        if buf is None or buf.shape[0] != height * width:
+            buf = self._points_buf = np.empty((height * width, 3), dtype=np.float32)
+        return buf
     
-    def convert_depth_to_point_cloud(self, depth_image, color_image=None, depth_scale=1000.0, max_depth=3.0):
-        """Convert depth image to point cloud."""
+    def _index_buffer(self, height, width):
+        """Int32 flat pixel index per point for the native kernel, reused across frames."""
+        buf = self._index_buf
+        if buf is None or buf.shape[0] != height * width:
+            buf = self._index_buf = np.empty(height * width, dtype=np.int32)
+        return buf
+    
+    def _fill_point_cloud(self, points, colors):
+        """Point the shared PointCloud at this frame's data."""
+        pc = self._pc
+        if pc is None:
+            pc = self._pc = PointCloud(points=points, colors=colors)
+        elif hasattr(pc, 'update'):
+            pc.update(points, colors)
+        else:
+            pc.points = points
+            pc.colors = colors
+        pc.n_valid = len(points)
+        return pc
+    
+    def _project_cuda(self, depth_image, ray_x, ray_y, depth_scale, max_depth_raw):
+        """Back-project on the GPU; returns host (points, flat pixel indices)."""
+        cp = self._cp
+        height, width = depth_image.shape
+        
+        # Stage the frame in pinned host memory so the upload is a true async DMA
+        pinned = self._pinned_depth
+        if pinned is None or pinned.shape != depth_image.shape or pinned.dtype != depth_image.dtype:
+            mem = cp.cuda.alloc_pinned_memory(depth_image.nbytes)
+            pinned = np.frombuffer(mem, depth_image.dtype, depth_image.size).reshape(depth_image.shape)
+            self._pinned_depth = pinned
+        np.copyto(pinned, depth_image)
+        
+        key, rays = self._gpu_rays
+        if key is not ray_x:
+            rays = (cp.asarray(ray_x), cp.asarray(ray_y))
+            self._gpu_rays = (ray_x, rays)
+        gpu_ray_x, gpu_ray_y = rays
+        
+        with self._cuda_stream:
+            d = cp.empty(depth_image.shape, dtype=depth_image.dtype)
+            d.set(pinned, stream=self._cuda_stream)
+            mask = (d > 0) & (d < max_depth_raw)
+            ys, xs = cp.nonzero(mask)
+            z = d[ys, xs].astype(cp.float32) / cp.float32(depth_scale)
+            points = cp.stack([gpu_ray_x[xs] * z, gpu_ray_y[ys] * z, z], axis=1)
+            flat_idx = ys * width + xs
+            host_points = points.get(stream=self._cuda_stream,
+                                     out=self._point_buffer(height, width)[:points.shape[0]])
+            result = host_points, flat_idx.get(stream=self._cuda_stream)
+        self._cuda_stream.synchronize()
+        return result
+    
+    def convert_depth_to_point_cloud(self, depth_image, color_image=None, depth_scale=1000.0, max_depth=3.0,
+                                     dtype='float32'):
+        """Convert depth image to point cloud.
+
+        Points are float32 meters by default. With dtype='int16_mm' they are
+        int16 millimeters (6 bytes per point); the cloud's ``scale`` attribute
+        converts stored values back to meters either way.
+
+        The returned cloud and its arrays are reused by the next call; copy
+        anything that has to outlive the current frame.
+        """
         if depth_image is None:
             return None
             
         # Get image dimensions
         height, width = depth_image.shape[:2]
         
-        # Create arrays for 3D points and colors
-        points = []
-        colors = []
-
-        # Create meshgrid for pixel coordinates
-        pixel_x, pixel_y = np.meshgrid(np.arange(width), np.arange(height))
-        pixel_x = pixel_x.flatten()
-        pixel_y = pixel_y.flatten()
+        max_depth_raw = max_depth * depth_scale
         
-        # Get depth values
-        z = depth_image.flatten() / depth_scale  # Convert to meters
+        # Only use colors that line up with the depth frame
+        if color_image is not None and not (len(color_image.shape) == 3 and
+                                            color_image.shape[0] == height and
+                                            color_image.shape[1] == width):
+            # Log a warning but continue without colors
+            print(f"Warning: Color image shape {color_image.shape} doesn't match depth shape {depth_image.shape}")
+            color_image = None
         
-        # Filter out invalid depth values
-        valid_indices = np.where((z > 0) & (z < max_depth))[0]
+        ray_x, ray_y = self._unit_rays(height, width)
         
-        # Safety check for empty valid_indices
-        if len(valid_indices) == 0:
-            return PointCloud()  # Return empty point cloud
+        colors = None
+        if self._use_cuda and depth_image.ndim == 2:
+            points, flat_idx = self._project_cuda(depth_image, ray_x, ray_y, depth_scale, max_depth_raw)
+            if len(points) == 0:
+                return PointCloud()  # Return empty point cloud
+            if color_image is not None:
+                colors = color_image.reshape(height * width, -1)[flat_idx, :3]
+        elif NATIVE_AVAILABLE and depth_image.ndim == 2 and depth_image.dtype == np.uint16:
+            # Worst case every pixel is valid, so the frame-sized buffer always fits
+            points = self._point_buffer(height, width)
+            flat_idx = self._index_buffer(height, width)
+            count = _native.project(np.ascontiguousarray(depth_image), height, width,
+                                    ray_x, ray_y, 1.0 / depth_scale, max_depth_raw,
+                                    points, flat_idx)
+            if count == 0:
+                return PointCloud()  # Return empty point cloud
+            points = points[:count]
+            if color_image is not None:
+                colors = color_image.reshape(height * width, -1)[flat_idx[:count], :3]
+        elif NUMBA_AVAILABLE and depth_image.ndim == 2:
+            # Fused single pass per row; row offsets let threads write
+            # their points without coordination
+            offsets = _row_offsets(depth_image, max_depth_raw)
+            count = offsets[-1]
+            if count == 0:
+                return PointCloud()  # Return empty point cloud
+            points = self._point_buffer(height, width)[:count]
+            _project(depth_image, ray_x, ray_y, np.float32(depth_scale),
+                     max_depth_raw, offsets, points)
+            if color_image is not None:
+                colors = np.empty((count, 3), dtype=color_image.dtype)
+                _gather_colors(depth_image, np.ascontiguousarray(color_image[:, :, :3]),
+                               max_depth_raw, offsets, colors)
+        else:
+            # Mask valid pixels in raw depth units so the whole frame is never
+            # converted to meters, then back-project only those pixels
+            mask = (depth_image > 0) & (depth_image < max_depth_raw)
+            ys, xs = np.nonzero(mask)
+            
+            # Safety check for empty mask
+            if ys.size == 0:
+                return PointCloud()  # Return empty point cloud
+                
+            z = depth_image[ys, xs].astype(np.float32) / np.float32(depth_scale)  # Convert to meters
+            
+            # Calculate 3D coordinates into the reused Nx3 buffer
+            points = self._point_buffer(height, width)[:z.size]
+            points[:, 0] = ray_x[xs] * z
+            points[:, 1] = ray_y[ys] * z
+            points[:, 2] = z
             
-        # Calculate 3D coordinates
-        x = (pixel_x[valid_indices] - self.cx) * z[valid_indices] / self.fx
-        y = (pixel_y[valid_indices] - self.cy) * z[valid_indices] / self.fy
-        z = z[valid_indices]
-        
-        # Combine XYZ coordinates
-        points = np.vstack([x, y, z]).T
-        
-        # Get colors if color image is available
-        if color_image is not None:
-            # Make sure color_image is the right shape for flattening
-            if len(color_image.shape) == 3 and color_image.shape[0] == height and color_image.shape[1] == width:
-                colors = color_image.reshape(-1, 3)[valid_indices]
-            else:
-                # Log a warning but continue without colors
-                print(f"Warning: Color image shape {color_image.shape} doesn't match depth shape {depth_image.shape}")
-        
-        # Create point cloud
-        point_cloud = PointCloud(points=points, colors=colors if len(colors) > 0 else None)
+            if color_image is not None:
+                if color_image.dtype == np.uint8 and color_image.shape[2] in (3, 4):
+                    # Gather one 4-byte word per pixel instead of three strided bytes
+                    if color_image.shape[2] == 3:
+                        color_image = np.dstack((color_image, np.zeros_like(color_image[:, :, :1])))
+                    packed = np.ascontiguousarray(color_image).view(np.uint32).reshape(height, width)[ys, xs]
+                    colors = packed.view(np.uint8).reshape(-1, 4)[:, :3]
+                else:
+                    colors = color_image[ys, xs]
+        
+        scale = 1.0
+        if dtype == 'int16_mm':
+            # ~1 mm Kinect resolution and <32 m range fit in int16
+            points = np.rint(points * 1000.0).astype(np.int16)
+            scale = 0.001
+        
+        # Update the shared point cloud in place
+        point_cloud = self._fill_point_cloud(points, colors)
+        point_cloud.scale = scale
         
         return point_cloud
     
     def release(self):
         """Release camera resources."""
-        if self.color_capture:
+        # Stop the capture threads before closing the devices they read
+        self._running = False
+        stuck = set()
+        for capture, thread in self._capture_threads:
+            thread.join(timeout=1.0)
+            if thread.is_alive():
+                # Still blocked in read(); releasing now would free the
+                # device under it, so the thread closes it when read() returns
+                print("Capture thread did not stop; it will release its camera on exit")
+                stuck.add(id(capture))
+        self._capture_threads = []
+        self._latest_color = None
+        self._latest_depth = None
+        
+        if self.color_capture and id(self.color_capture) not in stuck:
             self.color_capture.release()
-        if self.depth_capture:
+        if self.depth_capture and id(self.depth_capture) not in stuck:
             self.depth_capture.release()
\ No newline at end of file
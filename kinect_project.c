@@ -0,0 +1,106 @@
+/*
+ * kinect_project.c - native depth back-projection for kinect_processor.py
+ *
+ * Build (loaded with ctypes when present next to kinect_processor.py):
+ *   Linux:   cc -O3 -march=native -shared -fPIC -o libkinect_project.so kinect_project.c
+ *   Windows: cl /O2 /arch:AVX2 /LD kinect_project.c
+ *
+ * Without AVX2 the scalar loop is used for every pixel.
+ */
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(__AVX2__) && (defined(__GNUC__) || defined(_MSC_VER))
+#include <immintrin.h>
+#define KINECT_PROJECT_AVX2 1
+#ifdef _MSC_VER
+#include <intrin.h>
+/* Index of the lowest set bit; mask is never zero here */
+static __inline int lowest_bit(int mask)
+{
+    unsigned long i;
+    _BitScanForward(&i, (unsigned long)mask);
+    return (int)i;
+}
+#else
+#define lowest_bit(mask) __builtin_ctz(mask)
+#endif
+#endif
+
+#ifdef _WIN32
+#define EXPORT __declspec(dllexport)
+#else
+#define EXPORT
+#endif
+
+/*
+ * Back-project every pixel with 0 < depth < max_depth_raw.
+ *
+ * ray_x[x] and ray_y[y] are the precomputed (x - cx) / fx and (y - cy) / fy,
+ * so each coordinate is a single multiply by z. Points are written compactly
+ * to out_xyz (room for height * width points) in row-major pixel order, and
+ * the flat pixel index of each point goes to out_idx for the color gather.
+ * Returns the number of points written.
+ */
+EXPORT int project(const uint16_t *depth, int height, int width,
+                   const float *ray_x, const float *ray_y,
+                   float inv_depth_scale, float max_depth_raw,
+                   float *out_xyz, int32_t *out_idx)
+{
+    int n = 0;
+
+    for (int y = 0; y < height; y++) {
+        const uint16_t *row = depth + (size_t)y * width;
+        const float ry = ray_y[y];
+        int x = 0;
+
+#ifdef KINECT_PROJECT_AVX2
+        const __m256 zero = _mm256_setzero_ps();
+        const __m256 zmax = _mm256_set1_ps(max_depth_raw);
+        const __m256 scale = _mm256_set1_ps(inv_depth_scale);
+        const __m256 vry = _mm256_set1_ps(ry);
+
+        /* Eight depths per step: widen, mask, scale, multiply by the rays */
+        for (; x + 8 <= width; x += 8) {
+            __m128i raw = _mm_loadu_si128((const __m128i *)(row + x));
+            __m256 d = _mm256_cvtepi32_ps(_mm256_cvtepu16_epi32(raw));
+            __m256 valid = _mm256_and_ps(_mm256_cmp_ps(d, zero, _CMP_GT_OQ),
+                                         _mm256_cmp_ps(d, zmax, _CMP_LT_OQ));
+            int mask = _mm256_movemask_ps(valid);
+            if (!mask)
+                continue;
+
+            __m256 z = _mm256_mul_ps(d, scale);
+            float px[8], py[8], pz[8];
+            _mm256_storeu_ps(px, _mm256_mul_ps(_mm256_loadu_ps(ray_x + x), z));
+            _mm256_storeu_ps(py, _mm256_mul_ps(vry, z));
+            _mm256_storeu_ps(pz, z);
+
+            /* Compress the valid lanes into the output */
+            while (mask) {
+                int i = lowest_bit(mask);
+                mask &= mask - 1;
+                out_xyz[3 * n] = px[i];
+                out_xyz[3 * n + 1] = py[i];
+                out_xyz[3 * n + 2] = pz[i];
+                out_idx[n] = y * width + x + i;
+                n++;
+            }
+        }
+#endif
+
+        for (; x < width; x++) {
+            float d = row[x];
+            if (d <= 0.0f || d >= max_depth_raw)
+                continue;
+            float z = d * inv_depth_scale;
+            out_xyz[3 * n] = ray_x[x] * z;
+            out_xyz[3 * n + 1] = ry * z;
+            out_xyz[3 * n + 2] = z;
+            out_idx[n] = y * width + x;
+            n++;
+        }
+    }
+
+    return n;
+}
@@ -16,15 +16,25 @@ def main():
     # Define the path to the main application script
     hud_main_path = os.path.join(project_dir, "hud", "main.py")
     
-    # Ensure PYTHONPATH includes necessary directories
-    python_path = os.environ.get("PYTHONPATH", "")
-    os.environ["PYTHONPATH"] = f"{python_path}:{project_dir}:{os.path.join(project_dir, 'ai')}:{os.path.join(project_dir, 'hud')}"
+    # Ensure PYTHONPATH includes necessary directories, once each, so
+    # relaunches don't keep growing it
+    parts = [project_dir, os.path.join(project_dir, 'ai'), os.path.join(project_dir, 'hud')]
+    existing = os.environ.get("PYTHONPATH", "").split(os.pathsep)
+    merged = list(dict.fromkeys(p for p in existing + parts if p))
+    os.environ["PYTHONPATH"] = os.pathsep.join(merged)
     
     # Execute the main.py file using the virtual environment's Python
     python_exe = os.path.join(venv_path, "bin", "python")
     
     print(f"Launching Hextrix AI OS with {python_exe}")
-    subprocess.run([python_exe, hud_main_path])
+    sys.stdout.flush()
+    if os.name == 'nt':
+        # Windows execv spawns a detached child and returns the console
+        # early, so keep waiting on the child there
+        sys.exit(subprocess.run([python_exe, hud_main_path]).returncode)
+    
+    # Replace the launcher process instead of idling as its parent
+    os.execv(python_exe, [python_exe, hud_main_path])
 
 if __name__ == "__main__":
     main()
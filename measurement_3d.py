@@ -7,13 +7,23 @@ Compatible with Python 3.13 - no open3d dependency
 """
 
 import cv2
+import math
 import numpy as np
 import logging
+import queue
+import threading
 import time
 import base64
+from functools import lru_cache
 from io import BytesIO
 from PIL import Image
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Try to import Kinect-specific libraries, but provide fallbacks if not available
 try:
     from custom_pykinect2 import PyKinectRuntime
@@ -32,15 +42,181 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+# Kinect v2 depth readings beyond 8 meters are treated as invalid
+MAX_VALID_DEPTH_MM = 8000
+
+# Kinect v2 has approximately 70° horizontal FOV and 60° vertical FOV;
+# 2 * tan(FOV/2) * depth = visible extent in mm
+_H_FOV_FACTOR = 2.0 * math.tan(math.radians(70) / 2.0)
+_V_FOV_FACTOR = 2.0 * math.tan(math.radians(60) / 2.0)
+_MM_TO_IN = 1.0 / 25.4
+
+@lru_cache(maxsize=128)
+def _mm_per_pixel_factors(width, height):
+    """
+    Per-pixel FOV factors for a (width, height) depth ROI.
+
+    Multiplying by the object depth gives mm per pixel. A locked ROI in live
+    video or calibration hits the same entry on every frame.
+    """
+    return _H_FOV_FACTOR / width, _V_FOV_FACTOR / height
+
+
+# Seconds to wait for the capture thread to deliver a frame
+FRAME_TIMEOUT = 1.0
+
+
+def _depth_bbox_numpy(filtered_depth):
+    """
+    Outlier-filtered depth statistics and bounding box of a depth image.
+
+    Returns (mean, min_depth, max_depth, min_x, max_x, min_y, max_y,
+    center_depth), or None when no pixel survives filtering.
+    """
+    # Create a mask of valid depth values (non-zero and not too far)
+    valid_mask = (filtered_depth > 0) & (filtered_depth < MAX_VALID_DEPTH_MM)
+    valid_depths = filtered_depth[valid_mask]
+    if len(valid_depths) == 0:
+        return None
+    
+    # Calculate mean and standard deviation
+    mean_depth = np.mean(valid_depths)
+    std_depth = np.std(valid_depths)
+    
+    # Remove statistical outliers (values outside 2 standard deviations)
+    inlier_mask = abs(filtered_depth - mean_depth) < 2 * std_depth
+    inlier_mask &= valid_mask
+    
+    # Bounding box from per-row / per-column reductions instead of
+    # materializing every inlier coordinate with np.nonzero
+    rows_any = inlier_mask.any(axis=1)
+    if not rows_any.any():
+        return None
+    cols_any = inlier_mask.any(axis=0)
+    min_y = np.argmax(rows_any)
+    max_y = len(rows_any) - 1 - np.argmax(rows_any[::-1])
+    min_x = np.argmax(cols_any)
+    max_x = len(cols_any) - 1 - np.argmax(cols_any[::-1])
+    
+    min_depth = filtered_depth.min(where=inlier_mask, initial=MAX_VALID_DEPTH_MM)
+    max_depth = filtered_depth.max(where=inlier_mask, initial=0)
+    center_y, center_x = (min_y + max_y) // 2, (min_x + max_x) // 2
+    center_depth = filtered_depth[center_y, center_x] if inlier_mask[center_y, center_x] else 0
+    return (mean_depth, min_depth, max_depth,
+            min_x, max_x, min_y, max_y, center_depth)
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signatures compile at import time instead of on the first
+    # live frame; cache=True keeps the machine code between runs.
+    # medianBlur always hands these a fresh C-contiguous uint16 image.
+    # nogil lets the capture thread decode the next frame meanwhile.
+    @njit('Tuple((int64, float64, float64))(uint16[:, ::1], int64)',
+          parallel=True, fastmath=True, cache=True, nogil=True)
+    def compute_depth_stats(depth, max_valid):
+        """Count, mean and population std of valid depths in one pass over rows."""
+        height, width = depth.shape
+        # Exact integer accumulators: a row of 16-bit depths cannot overflow int64
+        row_sum = np.zeros(height, dtype=np.int64)
+        row_sumsq = np.zeros(height, dtype=np.int64)
+        row_count = np.zeros(height, dtype=np.int64)
+        for y in prange(height):
+            s = 0
+            sq = 0
+            c = 0
+            for x in range(width):
+                d = np.int64(depth[y, x])
+                if d > 0 and d < max_valid:
+                    s += d
+                    sq += d * d
+                    c += 1
+            row_sum[y] = s
+            row_sumsq[y] = sq
+            row_count[y] = c
+        n = row_count.sum()
+        if n == 0:
+            return 0, 0.0, 0.0
+        s = row_sum.sum()
+        mean = s / n
+        # Numerator in exact int64 (fits for n < ~379k pixels of depth
+        # < 8000): a constant-depth region gives std exactly 0, as np.std does
+        var = (n * row_sumsq.sum() - s * s) / (n * n)
+        return n, mean, np.sqrt(var)
+
+    @njit('Tuple((int64, int64, int64, int64, float64, float64))'
+          '(uint16[:, ::1], int64, float64, float64)',
+          parallel=True, cache=True, nogil=True)
+    def tighten_bbox(depth, max_valid, mean, std):
+        """
+        Bounding box and depth range of valid pixels within 2 std of the mean.
+
+        Returns (min_x, max_x, min_y, max_y, min_depth, max_depth); max_x is -1
+        when no pixel qualifies.
+        """
+        height, width = depth.shape
+        limit = 2 * std
+        row_min_x = np.full(height, width, dtype=np.int64)
+        row_max_x = np.full(height, -1, dtype=np.int64)
+        row_min_d = np.full(height, max_valid, dtype=np.float64)
+        row_max_d = np.zeros(height)
+        for y in prange(height):
+            for x in range(width):
+                d = depth[y, x]
+                if d == 0 or d >= max_valid or abs(d - mean) >= limit:
+                    continue
+                if x < row_min_x[y]:
+                    row_min_x[y] = x
+                row_max_x[y] = x
+                if d < row_min_d[y]:
+                    row_min_d[y] = d
+                if d > row_max_d[y]:
+                    row_max_d[y] = d
+        
+        min_x, max_x, min_y, max_y = width, -1, -1, -1
+        min_d, max_d = float(max_valid), 0.0
+        for y in range(height):
+            if row_max_x[y] < 0:
+                continue
+            if min_y < 0:
+                min_y = y
+            max_y = y
+            min_x = min(min_x, row_min_x[y])
+            max_x = max(max_x, row_max_x[y])
+            min_d = min(min_d, row_min_d[y])
+            max_d = max(max_d, row_max_d[y])
+        return min_x, max_x, min_y, max_y, min_d, max_d
+
+
+def _depth_bbox_numba(filtered_depth):
+    """Same result as _depth_bbox_numpy from two fused passes over the image."""
+    count, mean_depth, std_depth = compute_depth_stats(filtered_depth, MAX_VALID_DEPTH_MM)
+    if count == 0:
+        return None
+    min_x, max_x, min_y, max_y, min_depth, max_depth = tighten_bbox(
+        filtered_depth, MAX_VALID_DEPTH_MM, mean_depth, std_depth)
+    if max_x < 0:
+        return None
+    
+    center_depth = filtered_depth[(min_y + max_y) // 2, (min_x + max_x) // 2]
+    if abs(center_depth - mean_depth) >= 2 * std_depth or not 0 < center_depth < MAX_VALID_DEPTH_MM:
+        center_depth = 0
+    return (mean_depth, min_depth, max_depth, min_x, max_x, min_y, max_y, center_depth)
+
+
 class Measurement3DModule:
-    def __init__(self, safety_manager=None):
+    def __init__(self, safety_manager=None, quality="high"):
         """
         Initialize 3D Measurement Module with Kinect v2 support
         
         Args:
             safety_manager: Optional safety manager that handles consent and verification
+            quality: "high" (default) denoises depth with a 5x5 median filter,
+                "fast" with a 3x3 median filter
         """
+        if quality not in ("high", "fast"):
+            raise ValueError(f"quality must be 'high' or 'fast', got {quality!r}")
         self.kinect = None
+        self.quality = quality
         self.initialized = False
         self.safety_manager = safety_manager
         self.last_measurement = None
@@ -58,6 +234,16 @@ class Measurement3DModule:
         self.depth_scale = 0.001  # Kinect v2 depth scale (mm to meters)
         self.fallback_mode = not KINECT_AVAILABLE
         
+        # Newest (depth_image, color_image) pair from the capture thread;
+        # maxsize=1 so a slow measurement only ever sees the latest frame
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._capture_thread = None
+        self._capture_running = False
+        
+        # Per-thread BGR overlay image: concurrent Flask requests each draw
+        # into their own buffer, reused across that thread's captures
+        self._overlay_local = threading.local()
+        
     def initialize(self):
         """Initialize the Kinect camera"""
         if self.fallback_mode:
@@ -82,6 +268,7 @@ class Measurement3DModule:
                 logger.warning("Timed out waiting for depth frame")
                 return False
             
+            self._start_capture_thread()
             self.initialized = True
             logger.info("3D measurement module initialized successfully with Kinect v2")
             return True
@@ -90,9 +277,45 @@ class Measurement3DModule:
             self.initialized = False
             return False
     
+    def _start_capture_thread(self):
+        """Start pulling Kinect frames in the background"""
+        self._capture_running = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+    
+    def _capture_loop(self):
+        """Decode frames as they arrive, keeping only the newest in the queue"""
+        while self._capture_running:
+            kinect = self.kinect
+            if kinect is None:
+                break
+            
+            if not kinect.has_new_depth_frame() or not kinect.has_new_color_frame():
+                time.sleep(0.005)
+                continue
+            
+            depth_frame = kinect.get_last_depth_frame()
+            color_frame = kinect.get_last_color_frame()
+            if depth_frame is None or color_frame is None:
+                continue
+            
+            depth_image = depth_frame.reshape((kinect.depth_frame_desc.Height, kinect.depth_frame_desc.Width))
+            color_image = color_frame.reshape((kinect.color_frame_desc.Height, kinect.color_frame_desc.Width, 4))
+            
+            # Drop the stale frame, if any; this is the only producer
+            try:
+                self._frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._frame_queue.put_nowait((depth_image, color_image[:, :, :3]))
+    
     def shutdown(self):
         """Safely shut down the measurement system"""
         if self.kinect and not self.fallback_mode:
+            self._capture_running = False
+            if self._capture_thread is not None:
+                self._capture_thread.join(timeout=1.0)
+                self._capture_thread = None
             self.kinect.close()
             self.kinect = None
             self.initialized = False
@@ -120,19 +343,10 @@ class Measurement3DModule:
         
         try:
             # Get current frames
-            if not self.kinect.has_new_depth_frame() or not self.kinect.has_new_color_frame():
+            frames = self._read_frames()
+            if isinstance(frames, dict):
                 return {"status": "error", "message": "No frames available for calibration"}
-            
-            depth_frame = self.kinect.get_last_depth_frame()
-            color_frame = self.kinect.get_last_color_frame()
-            
-            if depth_frame is None or color_frame is None:
-                return {"status": "error", "message": "Failed to capture calibration frames"}
-            
-            # Convert frames to numpy arrays
-            depth_image = depth_frame.reshape((self.kinect.depth_frame_desc.Height, self.kinect.depth_frame_desc.Width))
-            color_image = color_frame.reshape((self.kinect.color_frame_desc.Height, self.kinect.color_frame_desc.Width, 4))
-            color_image = cv2.cvtColor(color_image, cv2.COLOR_BGRA2BGR)
+            depth_image, color_image = frames
             
             # Display for user calibration
             # In a full implementation, you would add UI for user to
@@ -169,20 +383,10 @@ class Measurement3DModule:
             Dict with measurement results or error
         """
         # Safety check
-        if require_consent and self.safety_manager:
-            if not self.safety_manager.check_consent(user_id, "3d_measurement"):
-                return {
-                    "status": "error",
-                    "message": "Consent required for 3D measurement",
-                    "requires_consent": True
-                }
-            
-            if not self.safety_manager.verify_age(user_id):
-                return {
-                    "status": "error", 
-                    "message": "Age verification required",
-                    "requires_verification": True
-                }
+        if require_consent:
+            safety_error = self._check_safety(user_id)
+            if safety_error:
+                return safety_error
         
         # System check
         if not self.initialized:
@@ -194,35 +398,65 @@ class Measurement3DModule:
             if self.fallback_mode:
                 return self._fallback_measurement(region_of_interest)
             
-            # Get current frames
-            if not self.kinect.has_new_depth_frame() or not self.kinect.has_new_color_frame():
-                return {"status": "error", "message": "No frames available for measurement"}
-            
-            depth_frame = self.kinect.get_last_depth_frame()
-            color_frame = self.kinect.get_last_color_frame()
+            frames = self._read_frames()
+            if isinstance(frames, dict):
+                return frames
+            depth_image, color_image = frames
             
-            if depth_frame is None or color_frame is None:
-                return {"status": "error", "message": "Failed to capture measurement frames"}
-            
-            # Convert frames to numpy arrays
-            depth_image = depth_frame.reshape((self.kinect.depth_frame_desc.Height, self.kinect.depth_frame_desc.Width))
-            color_image = color_frame.reshape((self.kinect.color_frame_desc.Height, self.kinect.color_frame_desc.Width, 4))
-            color_image = cv2.cvtColor(color_image, cv2.COLOR_BGRA2BGR)
-            
-            # Map the depth frame to color frame space for alignment
-            # Note: In a full implementation, you would use the Kinect's coordinate mapper
-            # For simplicity, we'll just resize the depth image to match color dimensions
-            depth_resized = cv2.resize(depth_image, 
-                                     (self.kinect.color_frame_desc.Width, self.kinect.color_frame_desc.Height), 
-                                     interpolation=cv2.INTER_NEAREST)
+            return self._measure_from_frames(depth_image, color_image, region_of_interest)
             
+        except Exception as e:
+            logger.error(f"Error measuring object: {str(e)}")
+            return {"status": "error", "message": str(e)}
+    
+    def _check_safety(self, user_id):
+        """Return an error result if consent or age verification fails, else None"""
+        if not self.safety_manager:
+            return None
+        
+        if not self.safety_manager.check_consent(user_id, "3d_measurement"):
+            return {
+                "status": "error",
+                "message": "Consent required for 3D measurement",
+                "requires_consent": True
+            }
+        
+        if not self.safety_manager.verify_age(user_id):
+            return {
+                "status": "error", 
+                "message": "Age verification required",
+                "requires_verification": True
+            }
+        
+        return None
+    
+    def _read_frames(self):
+        """
+        Take the newest decoded depth and color frames from the capture thread
+        
+        Returns:
+            (depth_image, color_image) or an error result dict. color_image is a
+            BGR view into the BGRA frame, so no full-frame conversion copy is made.
+        """
+        try:
+            return self._frame_queue.get(timeout=FRAME_TIMEOUT)
+        except queue.Empty:
+            return {"status": "error", "message": "No frames available for measurement"}
+    
+    def _measure_from_frames(self, depth_image, color_image, region_of_interest=None):
+        """Measure from already-decoded depth and color images"""
+        try:
             # Apply ROI if specified
+            # The ROI is given in color-frame pixels; scale it to depth-frame pixels
+            # instead of upsampling the whole depth map to color resolution.
+            # Note: In a full implementation, you would use the Kinect's coordinate mapper
             if region_of_interest:
                 x, y, w, h = region_of_interest
-                depth_roi = depth_resized[y:y+h, x:x+w]
+                dx, dy, dw, dh = self._color_roi_to_depth(region_of_interest)
+                depth_roi = depth_image[dy:dy+dh, dx:dx+dw]
                 color_roi = color_image[y:y+h, x:x+w]
             else:
-                depth_roi = depth_resized
+                depth_roi = depth_image
                 color_roi = color_image
             
             # Process with custom point cloud function
@@ -244,6 +478,21 @@ class Measurement3DModule:
             logger.error(f"Error measuring object: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    def _color_roi_to_depth(self, region_of_interest):
+        """Scale an (x, y, w, h) color-frame ROI to depth-frame pixels"""
+        color_w = self.kinect.color_frame_desc.Width
+        color_h = self.kinect.color_frame_desc.Height
+        depth_w = self.kinect.depth_frame_desc.Width
+        depth_h = self.kinect.depth_frame_desc.Height
+        
+        x, y, w, h = region_of_interest
+        x0 = x * depth_w // color_w
+        y0 = y * depth_h // color_h
+        # Round the far edge up so a small ROI never collapses to zero pixels
+        x1 = max(-(-(x + w) * depth_w // color_w), x0 + 1)
+        y1 = max(-(-(y + h) * depth_h // color_h), y0 + 1)
+        return x0, y0, x1 - x0, y1 - y0
+    
     def _fallback_measurement(self, region_of_interest=None):
         """Generate simulated measurements for fallback mode"""
         # Create simulated measurements - this would be replaced with actual
@@ -264,9 +513,9 @@ class Measurement3DModule:
             "depth_mm": round(depth, 1),
             "volume_mm3": round(volume, 1),
             "surface_area_mm2": round(surface_area, 1),
-            "width_inches": round(width / 25.4, 1),
-            "height_inches": round(height / 25.4, 1),
-            "depth_inches": round(depth / 25.4, 1)
+            "width_inches": round(width * _MM_TO_IN, 1),
+            "height_inches": round(height * _MM_TO_IN, 1),
+            "depth_inches": round(depth * _MM_TO_IN, 1)
         }
         
         self.last_measurement = measurements
@@ -284,23 +533,25 @@ class Measurement3DModule:
         
         This implements core functionality for Kinect v2 depth processing
         """
-        # Convert Kinect depth values to millimeters
-        # Kinect V2 depth values are in millimeters already, but we apply the calibration factor
-        depth_mm = depth_image.astype(np.float32) * self.calibration_factor
+        # Kinect V2 depth values are in millimeters already, so stay in uint16
+        # and apply the calibration factor to the final measurements
+        depth_u16 = np.ascontiguousarray(depth_image, dtype=np.uint16)
         
         # Filter the depth image to remove noise
-        # Use a median filter
-        filtered_depth = cv2.medianBlur(depth_mm.astype(np.uint16), 5)
-        
-        # Remove outliers
-        # Create a mask of valid depth values (non-zero and not too far)
-        valid_mask = (filtered_depth > 0) & (filtered_depth < 8000)  # 8 meters max for Kinect
-        
-        # Get all valid depth values
-        valid_depths = filtered_depth[valid_mask]
-        
-        if len(valid_depths) == 0:
-            # No valid depths, return default values
+        # Use a median filter: it never invents depths at dropouts or object
+        # edges. The 3x3 kernel runs on OpenCV's sorting network, several
+        # times faster than 5x5 on uint16.
+        filtered_depth = cv2.medianBlur(depth_u16, 3 if self.quality == "fast" else 5)
+        
+        # Remove outliers (beyond 2 standard deviations) and find the
+        # bounding box of what remains
+        if NUMBA_AVAILABLE:
+            bbox = _depth_bbox_numba(filtered_depth)
+        else:
+            bbox = _depth_bbox_numpy(filtered_depth)
+        
+        if bbox is None:
+            # No valid points
             return {
                 "width_mm": 0.0,
                 "height_mm": 0.0,
@@ -312,66 +563,33 @@ class Measurement3DModule:
                 "depth_inches": 0.0
             }
         
-        # Calculate mean and standard deviation
-        mean_depth = np.mean(valid_depths)
-        std_depth = np.std(valid_depths)
-        
-        # Remove statistical outliers (values outside 2 standard deviations)
-        inlier_mask = abs(filtered_depth - mean_depth) < 2 * std_depth
-        filtered_depth = np.where(inlier_mask & valid_mask, filtered_depth, 0)
-        
-        # Find min and max depth values
-        min_depth = np.min(filtered_depth[filtered_depth > 0])
-        max_depth = np.max(filtered_depth[filtered_depth > 0])
+        mean_depth, min_depth, max_depth, min_x, max_x, min_y, max_y, center_depth = bbox
         
         # Get image dimensions
         height, width = filtered_depth.shape
         
-        # Calculate bounding box in image coordinates
-        # Find non-zero points
-        y_coords, x_coords = np.nonzero(filtered_depth)
-        
-        if len(y_coords) == 0 or len(x_coords) == 0:
-            # No valid points
-            return {
-                "width_mm": 0.0,
-                "height_mm": 0.0,
-                "depth_mm": 0.0,
-                "volume_mm3": 0.0,
-                "surface_area_mm2": 0.0,
-                "width_inches": 0.0,
-                "height_inches": 0.0,
-                "depth_inches": 0.0
-            }
-        
-        # Get bounding box
-        min_x, max_x = np.min(x_coords), np.max(x_coords)
-        min_y, max_y = np.min(y_coords), np.max(y_coords)
-        
         # Calculate 3D dimensions
         # For Kinect v2, we can use the field of view to convert from pixels to real-world units
         # Kinect v2 has approximately 70° horizontal FOV and 60° vertical FOV
         
-        # Get the center depth of the object
-        center_x = (min_x + max_x) // 2
-        center_y = (min_y + max_y) // 2
-        center_depth = filtered_depth[center_y, center_x]
+        # Use the center depth of the object
         if center_depth == 0:
             center_depth = mean_depth  # Use mean depth if center point is invalid
         
         # Calculate pixel to mm conversion at the current depth
         # tan(FOV/2) * 2 * depth = width in mm
-        horizontal_mm_per_pixel = np.tan(np.radians(70) / 2) * 2 * center_depth / width
-        vertical_mm_per_pixel = np.tan(np.radians(60) / 2) * 2 * center_depth / height
+        h_factor, v_factor = _mm_per_pixel_factors(width, height)
+        horizontal_mm_per_pixel = center_depth * h_factor
+        vertical_mm_per_pixel = center_depth * v_factor
         
         # Calculate object dimensions
         width_pixels = max_x - min_x
         height_pixels = max_y - min_y
         depth_range = max_depth - min_depth
         
-        width_mm = width_pixels * horizontal_mm_per_pixel
-        height_mm = height_pixels * vertical_mm_per_pixel
-        depth_mm = depth_range
+        width_mm = width_pixels * horizontal_mm_per_pixel * self.calibration_factor
+        height_mm = height_pixels * vertical_mm_per_pixel * self.calibration_factor
+        depth_mm = depth_range * self.calibration_factor
         
         # Calculate volume (approximate)
         volume_mm3 = width_mm * height_mm * depth_mm
@@ -385,13 +603,26 @@ class Measurement3DModule:
             "depth_mm": round(depth_mm, 1),
             "volume_mm3": round(volume_mm3, 1),
             "surface_area_mm2": round(surface_area_mm2, 1),
-            "width_inches": round(width_mm / 25.4, 1),
-            "height_inches": round(height_mm / 25.4, 1),
-            "depth_inches": round(depth_mm / 25.4, 1)
+            "width_inches": round(width_mm * _MM_TO_IN, 1),
+            "height_inches": round(height_mm * _MM_TO_IN, 1),
+            "depth_inches": round(depth_mm * _MM_TO_IN, 1)
         }
     
+    def _overlay_image(self, color_image):
+        """Copy color_image into the calling thread's overlay buffer"""
+        buf = getattr(self._overlay_local, 'buffer', None)
+        if buf is None or buf.shape != color_image.shape:
+            buf = self._overlay_local.buffer = np.empty(color_image.shape, np.uint8)
+        np.copyto(buf, color_image)
+        return buf
+    
     def capture_frame_with_measurement(self, region_of_interest=None, user_id=None):
-        """Capture a frame with measurement overlay"""
+        """
+        Capture a frame with measurement overlay
+        
+        The returned Kinect image is reused by the calling thread's next
+        capture; copy it if it has to outlive that call.
+        """
         if not self.initialized:
             if not self.initialize():
                 return None, {"status": "error", "message": "Failed to initialize system"}
@@ -438,29 +669,24 @@ class Measurement3DModule:
                 
                 return result_image, measurement_result
             
+            safety_error = self._check_safety(user_id)
+            if safety_error:
+                return None, safety_error
+            
+            # Fetch the frames once and draw the overlay on the same color image
+            frames = self._read_frames()
+            if isinstance(frames, dict):
+                return None, frames
+            depth_image, color_image = frames
+            
             # Measure the object
-            measurement_result = self.measure_object(
-                region_of_interest=region_of_interest, 
-                require_consent=True, 
-                user_id=user_id
-            )
+            measurement_result = self._measure_from_frames(depth_image, color_image, region_of_interest)
             
             if measurement_result["status"] != "success":
                 return None, measurement_result
             
-            # Get current frame
-            if not self.kinect.has_new_color_frame():
-                return None, {"status": "error", "message": "No color frame available"}
-                
-            color_frame = self.kinect.get_last_color_frame()
-            if color_frame is None:
-                return None, {"status": "error", "message": "Failed to get color frame"}
-                
-            color_image = color_frame.reshape((self.kinect.color_frame_desc.Height, self.kinect.color_frame_desc.Width, 4))
-            color_image = cv2.cvtColor(color_image, cv2.COLOR_BGRA2BGR)
-            
-            # Draw measurement overlay
-            result_image = color_image.copy()
+            # Draw measurement overlay; the copy into the buffer is also the BGRA->BGR conversion
+            result_image = self._overlay_image(color_image)
             measurements = measurement_result["measurements"]
             
             # Draw ROI if specified
@@ -1,45 +1,81 @@
 import torch
 import torch.nn as nn
-import torchvision.models as models
+import torch.nn.functional as F
+
+class FeatureTap(nn.Module):
+    """Truncated VGG whose forward returns the captured intermediate activations."""
+    def __init__(self, layers, capture):
+        super().__init__()
+        self.layers = nn.Sequential(*layers)
+        self.capture = capture
+
+    def forward(self, x):
+        features = []
+        for idx, layer in enumerate(self.layers):
+            x = layer(x)
+            if idx in self.capture:
+                features.append(x)
+        return features
 
 class NeuralStyleTransfer:
     def __init__(self):
-        self.vgg = models.vgg19(pretrained=True).features.eval()
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        # VGG19 weights are hundreds of MB; load them on first use
+        self._vgg = None
+        self._features = None
         self.style_layers = ['0', '5', '10', '19', '28']
         self.content_layers = ['21']
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        
+
+        # Extraction stops at the content layer, so only run VGG up to there
+        self._stop_idx = int(self.content_layers[0])
+        self._capture = frozenset(int(name) for name in self.style_layers + self.content_layers
+                                  if int(name) <= self._stop_idx)
+
+        self.style_weight = torch.tensor(1e6, device=self.device)
+
+    @property
+    def vgg(self):
+        if self._vgg is None:
+            import torchvision.models as models
+            self._vgg = models.vgg19(weights=models.VGG19_Weights.DEFAULT).features.eval().to(self.device)
+        return self._vgg
+
+    @property
+    def _features_trunc(self):
+        if self._features is None:
+            self._features = FeatureTap(list(self.vgg.children())[:self._stop_idx + 1], self._capture)
+        return self._features
+
+    @staticmethod
+    def gram(x):
+        # (b, d, h, w) -> (b, d, d); the transpose folds into the batched GEMM
+        f = x.flatten(2)
+        return f @ f.transpose(1, 2)
+
     def extract_features(self, x):
-        features = []
-        for name, layer in self.vgg._modules.items():
-            x = layer(x)
-            if name in self.style_layers + self.content_layers:
-                features.append(x)
-            if name == self.content_layers[0]:
-                break
-        return features
+        return self._features_trunc(x)
 
     def calculate_loss(self, content, style, generated):
-        content_loss = torch.mean((generated - content)**2)
+        content_loss = F.mse_loss(generated, content)
         style_loss = 0
         for gen_feat, style_feat in zip(generated, style):
-            _, d, h, w = gen_feat.size()
-            G = torch.mm(gen_feat.view(d, h*w), gen_feat.view(d, h*w).t())
-            A = torch.mm(style_feat.view(d, h*w), style_feat.view(d, h*w).t())
-            style_loss += torch.mean((G - A)**2)
-        return content_loss + style_loss * 1e6
+            style_loss += F.mse_loss(self.gram(gen_feat), self.gram(style_feat))
+        return content_loss + style_loss * self.style_weight
 
 class DistributedStyleTrainer:
     def __init__(self, num_gpus=4):
         self.num_gpus = num_gpus
         self.model = NeuralStyleTransfer()
-        self.optimizer = torch.optim.Adam(self.model.parameters(), lr=0.001)
+        # The model already lives on its device; wrap it for multi-GPU once, not per batch
+        self.device = self.model.device
+        if torch.cuda.device_count() > 1:
+            self.model._features = nn.DataParallel(self.model._features_trunc)
+        self.optimizer = torch.optim.Adam(self.model.vgg.parameters(), lr=0.001)
         
     def train_batch(self, content_batch, style_batch):
-        # Distributed training logic
-        if torch.cuda.device_count() > 1:
-            self.model = nn.DataParallel(self.model)
-        self.model.to(self.device)
+        # Distributed training logic; batches from a pin_memory DataLoader copy asynchronously
+        content_batch = content_batch.to(self.device, non_blocking=True)
+        style_batch = style_batch.to(self.device, non_blocking=True)
         
         content_features = self.model.extract_features(content_batch)
         style_features = self.model.extract_features(style_batch)
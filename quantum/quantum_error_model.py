@@ -1,17 +1,48 @@
+from typing import Optional
+
 import numpy as np
-import scipy.sparse as sparse
+
+PAULI_LABELS = ('X', 'Y', 'Z')
 
 class QuantumErrorModel:
-    def __init__(self, error_rate: float):
+    def __init__(self, error_rate: float, seed: Optional[int] = None):
         self.error_rate = error_rate
+        # Counter-based generator: one instance, vectorized draws, reproducible with a seed
+        self._rng = np.random.Generator(np.random.Philox(seed))
 
     def apply_noise(self, state):
-        for i in range(state.num_qubits):
-            if np.random.random() < self.error_rate:
-                random_gate = np.random.choice(['X', 'Y', 'Z'])
-                operator = {
-                    'X': sparse.csr_matrix([[0, 1], [1, 0]]),
-                    'Y': sparse.csr_matrix([[0, -1j], [1j, 0]]),
-                    'Z': sparse.csr_matrix([[1, 0], [0, -1]])
-                }[random_gate]
-                state.apply_operator(operator)
+        n = state.num_qubits
+        # One draw for every qubit, then a Pauli choice only for the qubits that were hit
+        hits = np.flatnonzero(self._rng.random(n) < self.error_rate)
+        choices = self._rng.integers(0, 3, size=hits.size)
+        for qubit, choice in zip(hits, choices):
+            # Paulis permute / phase amplitudes in place; no operator is built
+            getattr(state, f'apply_{PAULI_LABELS[choice].lower()}')(int(qubit))
+
+    def apply_noise_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Apply independent depolarizing noise to every shot of a (num_shots, 2**n)
+        array of state vectors in place, one vectorized pass per qubit.
+        """
+        if not states.flags.c_contiguous:
+            # reshape would silently copy and the noise would never reach the caller
+            raise ValueError("apply_noise_batch needs a C-contiguous states array")
+        num_shots, dim = states.shape
+        n = dim.bit_length() - 1
+        hits = self._rng.random((num_shots, n)) < self.error_rate
+        choices = self._rng.integers(0, 3, size=(num_shots, n))
+        for qubit in range(n):
+            # (shots, 2**qubit, 2, rest) view; axis 2 is this qubit (most significant first)
+            psi = states.reshape(num_shots, 1 << qubit, 2, -1)
+            hit = hits[:, qubit]
+            x_shots = hit & (choices[:, qubit] == 0)
+            y_shots = hit & (choices[:, qubit] == 1)
+            z_shots = hit & (choices[:, qubit] == 2)
+            if x_shots.any():
+                psi[x_shots] = psi[x_shots][:, :, ::-1]
+            if y_shots.any():
+                sub = psi[y_shots]
+                psi[y_shots] = np.stack((-1j * sub[:, :, 1], 1j * sub[:, :, 0]), axis=2)
+            if z_shots.any():
+                psi[z_shots, :, 1] *= -1
+        return states
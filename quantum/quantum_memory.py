@@ -1,11 +1,12 @@
+from collections import deque
+
 class QuantumMemory:
     def __init__(self, capacity: int):
         self.capacity = capacity
-        self.memory = []
+        self.memory = deque(maxlen=capacity)
 
     def store(self, state):
-        if len(self.memory) >= self.capacity:
-            self.memory.pop(0)
+        # A full deque drops its oldest entry on append
         self.memory.append(state)
 
     def retrieve(self, index: int):
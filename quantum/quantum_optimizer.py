@@ -1,22 +1,43 @@
+from multiprocessing import Pool
+
+import numpy as np
+
 class QuantumOptimizer:
-    def __init__(self, cost_function, num_params: int):
+    def __init__(self, cost_function, num_params: int, vectorized: bool = False, epsilon: float = 1e-6,
+                 parameter_shift: bool = False, processes: int = None):
+        # vectorized=True means cost_function maps a (batch, num_params) array to (batch,) costs.
+        # parameter_shift=True uses the exact shift rule for Pauli-rotation parameters:
+        # df/dtheta = (f(theta + pi/2) - f(theta - pi/2)) / 2.
+        # processes > 0 evaluates a scalar (picklable) cost_function in a process pool.
         self.cost_function = cost_function
         self.num_params = num_params
+        self.vectorized = vectorized
+        self.epsilon = epsilon
+        self.parameter_shift = parameter_shift
+        self.processes = processes
+        shift = np.pi / 2 if parameter_shift else epsilon
+        self._denominator = 2.0 if parameter_shift else 2 * epsilon
+        self._perturbations = shift * np.eye(num_params)
 
     def optimize(self, initial_params, iterations: int = 100):
-        params = initial_params
-        for _ in range(iterations):
-            gradient = self._compute_gradient(params)
-            params = [p - 0.01 * g for p, g in zip(params, gradient)]
+        params = np.array(initial_params, dtype=np.float64)
+        pool = Pool(self.processes) if self.processes and not self.vectorized else None
+        try:
+            for _ in range(iterations):
+                params -= 0.01 * self._compute_gradient(params, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
         return params
 
-    def _compute_gradient(self, params):
-        epsilon = 1e-6
-        gradient = []
-        for i in range(self.num_params):
-            params_plus = params.copy()
-            params_plus[i] += epsilon
-            params_minus = params.copy()
-            params_minus[i] -= epsilon
-            gradient.append((self.cost_function(params_plus) - self.cost_function(params_minus)) / (2 * epsilon))
-        return gradient
+    def _compute_gradient(self, params, pool=None):
+        # Rows of the stack are params shifted by +/- epsilon (or pi/2) along each axis
+        stacked = np.concatenate((params + self._perturbations, params - self._perturbations))
+        if self.vectorized:
+            costs = np.asarray(self.cost_function(stacked), dtype=np.float64)
+        elif pool is not None:
+            costs = np.array(pool.map(self.cost_function, stacked), dtype=np.float64)
+        else:
+            costs = np.array([self.cost_function(p) for p in stacked], dtype=np.float64)
+        return (costs[:self.num_params] - costs[self.num_params:]) / self._denominator
@@ -4,21 +4,44 @@ import scipy.sparse as sparse
 class QuantumState:
     def __init__(self, num_qubits: int):
         self.num_qubits = num_qubits
-        self.state = sparse.csr_matrix((1, 2**num_qubits), dtype=np.complex128)
-        self.state[0, 0] = 1  # Initialize to |0...0> state
+        # Dense amplitudes: after a few gates almost every entry is nonzero
+        self.state = np.zeros(2**num_qubits, dtype=np.complex128)
+        self.state[0] = 1  # Initialize to |0...0> state
 
     def get_vector(self) -> np.ndarray:
-        return self.state.toarray().flatten()
+        # Gates update self.state in place, so hand out a snapshot
+        return self.state.copy()
 
     def set_vector(self, vector: np.ndarray):
         if vector.shape != (2**self.num_qubits,):
             raise ValueError(f"Vector shape mismatch. Expected {2**self.num_qubits}, got {vector.shape[0]}")
-        self.state = sparse.csr_matrix(vector.reshape(1, -1))
+        # Own C-contiguous copy: the per-qubit reshapes below are views and
+        # gates write through them, which must not reach the caller's array
+        self.state = np.array(vector, dtype=np.complex128, order="C")
 
     def normalize(self):
-        norm = np.linalg.norm(self.state.data)
-        self.state.data /= norm
+        self.state /= np.linalg.norm(self.state)
 
     def apply_operator(self, operator: sparse.csr_matrix):
-        self.state = operator.dot(self.state.T).T
+        # Sparse matrix times dense vector runs as a single csr_matvec
+        self.state = operator @ self.state
         self.normalize()
+
+    def _qubit_view(self, qubit: int) -> np.ndarray:
+        # (2**qubit, 2, rest) view whose middle axis is `qubit`; qubit 0 is the most significant bit
+        return self.state.reshape(1 << qubit, 2, -1)
+
+    def apply_x(self, qubit: int):
+        psi = self._qubit_view(qubit)
+        flipped = psi[:, 0].copy()
+        psi[:, 0] = psi[:, 1]
+        psi[:, 1] = flipped
+
+    def apply_y(self, qubit: int):
+        psi = self._qubit_view(qubit)
+        flipped = psi[:, 0].copy()
+        psi[:, 0] = -1j * psi[:, 1]
+        psi[:, 1] = 1j * flipped
+
+    def apply_z(self, qubit: int):
+        self._qubit_view(qubit)[:, 1] *= -1
@@ -1,8 +1,7 @@
-import matplotlib.pyplot as plt
-from qiskit.visualization import plot_bloch_multivector
-from qiskit.quantum_info import Statevector
+import numpy as np
 
 def visualize_state(state):
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 5))
     plt.bar(range(len(state)), np.abs(state)**2)
     plt.title("Quantum State Probabilities")
@@ -10,7 +9,47 @@ def visualize_state(state):
     plt.ylabel("Probability")
     plt.show()
 
+# Figure reused across visualize_bloch_sphere calls: (figure, arrow lines)
+_bloch_figure = None
+
+def bloch_vectors(state):
+    """Single-qubit Bloch vectors of a pure state, shape (n, 3), qubit 0 first."""
+    n = int(np.log2(len(state)))
+    psi = np.asarray(state, dtype=np.complex128).reshape([2] * n)
+    vectors = np.empty((n, 3))
+    for q in range(n):
+        # Qubit 0 is the least significant bit, i.e. the last tensor axis
+        m = np.moveaxis(psi, n - 1 - q, 0).reshape(2, -1)
+        rho = m @ m.conj().T
+        vectors[q] = (2 * rho[0, 1].real, -2 * rho[0, 1].imag, (rho[0, 0] - rho[1, 1]).real)
+    return vectors
+
 def visualize_bloch_sphere(state):
-    qiskit_state = Statevector(state)
-    plot_bloch_multivector(qiskit_state)
-    plt.show()
+    global _bloch_figure
+    import matplotlib.pyplot as plt
+    vectors = bloch_vectors(state)
+    n = len(vectors)
+
+    if _bloch_figure is None or len(_bloch_figure[1]) != n or not plt.fignum_exists(_bloch_figure[0].number):
+        plt.ion()
+        fig = plt.figure(figsize=(3 * n, 3))
+        u, v = np.mgrid[0:2 * np.pi:24j, 0:np.pi:12j]
+        arrows = []
+        for q in range(n):
+            ax = fig.add_subplot(1, n, q + 1, projection='3d')
+            ax.plot_wireframe(np.cos(u) * np.sin(v), np.sin(u) * np.sin(v), np.cos(v),
+                              color='lightgray', linewidth=0.5)
+            ax.set_xlim(-1, 1)
+            ax.set_ylim(-1, 1)
+            ax.set_zlim(-1, 1)
+            ax.set_axis_off()
+            ax.set_title(f"qubit {q}")
+            arrows.append(ax.plot([0, 0], [0, 0], [0, 1], color='tab:red', linewidth=2)[0])
+        _bloch_figure = (fig, arrows)
+
+    # Only the arrows change between calls
+    fig, arrows = _bloch_figure
+    for line, (x, y, z) in zip(arrows, vectors):
+        line.set_data_3d([0, x], [0, y], [0, z])
+    fig.canvas.draw_idle()
+    fig.canvas.flush_events()
@@ -1,25 +1,35 @@
-import numpy as np
+import math
+from functools import lru_cache
 
-def simulate_shor_algorithm(n: int, a: int) -> int:
-    def quantum_period_finding(a, N):
-        x, y = a, 1
-        r = 0
-        while y != 1:
-            x = (x * a) % N
-            y = (y * a) % N
-            r += 1
-        return r
+@lru_cache(maxsize=1024)
+def quantum_period_finding(a: int, N: int) -> int:
+    # Simulate quantum period finding using classical computation.
+    # The order of a mod N is below N, so give up (return 0) after N steps.
+    # Memoized so repeated factorizations of the same N skip known bases.
+    y = a % N
+    r = 1
+    while y != 1:
+        if r >= N:
+            return 0
+        y = (y * a) % N
+        r += 1
+    return r
 
+def simulate_shor_algorithm(n: int, a: int) -> int:
     if n % 2 == 0:
         return 2
 
-    r = quantum_period_finding(a, n)
-
-    if r % 2 != 0:
-        return simulate_shor_algorithm(n, a + 1)
+    # Try successive bases iteratively instead of recursing on failure
+    while a < n:
+        common = math.gcd(a, n)
+        if common != 1:
+            return common
 
-    factor = np.gcd(a**(r // 2) - 1, n)
-    if factor == 1 or factor == n:
-        return simulate_shor_algorithm(n, a + 1)
+        r = quantum_period_finding(a, n)
+        if r and r % 2 == 0:
+            factor = math.gcd(pow(a, r // 2, n) - 1, n)
+            if factor != 1 and factor != n:
+                return factor
+        a += 1
 
-    return factor
+    raise ValueError(f"No nontrivial factor of {n} found")
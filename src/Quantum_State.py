@@ -1,26 +1,82 @@
+import cmath
+import math
 import numpy as np
 import scipy.sparse as sparse
-from typing import List, Tuple, Union, Optional, Callable
-from scipy.linalg import expm
-import matplotlib.pyplot as plt
-from qiskit import QuantumCircuit as QiskitQuantumCircuit
-from qiskit import Aer, execute
-from qiskit.quantum_info import Statevector
-from qiskit.visualization import plot_state_qsphere, plot_bloch_multivector
+from typing import Any, List, Tuple, Union, Optional, Callable
 from multiprocessing import Pool
-from functools import partial
+from functools import partial, lru_cache
+from collections import deque
 import logging
 import json
 from tqdm import tqdm
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Amplitude pairs per cache block: two contiguous 64 KB runs of complex128
+GATE_BLOCK = 1 << 12
+
+if NUMBA_AVAILABLE:
+    # In-place state-vector kernels. `bit` is the position of the target qubit's
+    # bit in the basis index (qubit q of n sits at bit n - 1 - q).
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def apply_1q(state, u00, u01, u10, u11, bit):
+        stride = 1 << bit
+        low = stride - 1
+        pairs = state.size >> 1
+        if stride >= GATE_BLOCK:
+            # High target: partners are far apart, so give each thread whole
+            # blocks of pairs that lie in two contiguous runs (GATE_BLOCK divides
+            # stride, so a block never straddles an inserted bit)
+            for blk in prange(pairs // GATE_BLOCK):
+                k0 = blk * GATE_BLOCK
+                base = ((k0 >> bit) << (bit + 1)) | (k0 & low)
+                for i0 in range(base, base + GATE_BLOCK):
+                    a = state[i0]
+                    b = state[i0 + stride]
+                    state[i0] = u00 * a + u01 * b
+                    state[i0 + stride] = u10 * a + u11 * b
+            return
+        for k in prange(pairs):
+            # k-th amplitude pair: insert a 0 at `bit` to get the |..0..> index
+            i0 = ((k >> bit) << (bit + 1)) | (k & low)
+            i1 = i0 | stride
+            a = state[i0]
+            b = state[i1]
+            state[i0] = u00 * a + u01 * b
+            state[i1] = u10 * a + u11 * b
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def apply_2q(state, u, bit0, bit1):
+        # u is 4x4 with the first target (bit0) as its most significant bit
+        s0 = 1 << bit0
+        s1 = 1 << bit1
+        lo = min(bit0, bit1)
+        hi = max(bit0, bit1)
+        for k in prange(state.size >> 2):
+            i = ((k >> lo) << (lo + 1)) | (k & ((1 << lo) - 1))
+            i = ((i >> hi) << (hi + 1)) | (i & ((1 << hi) - 1))
+            idx = (i, i | s1, i | s0, i | s0 | s1)
+            a0 = state[idx[0]]
+            a1 = state[idx[1]]
+            a2 = state[idx[2]]
+            a3 = state[idx[3]]
+            for r in range(4):
+                state[idx[r]] = u[r, 0] * a0 + u[r, 1] * a1 + u[r, 2] * a2 + u[r, 3] * a3
+
 class QuantumState:
     def __init__(self, num_qubits: int):
         self.num_qubits = num_qubits
-        self.state = sparse.csr_matrix((1, 2**num_qubits), dtype=np.complex128)
-        self.state[0, 0] = 1  # Initialize to |0...0> state
+        # Dense amplitudes: after a few gates almost every entry is nonzero
+        self.state = np.zeros(2**num_qubits, dtype=np.complex128)
+        self.state[0] = 1  # Initialize to |0...0> state
 
     def __str__(self):
         return f"Quantum state with {self.num_qubits} qubits"
@@ -29,36 +85,69 @@ class QuantumState:
         return self.__str__()
 
     def get_vector(self) -> np.ndarray:
-        return self.state.toarray().flatten()
+        # Gates update self.state in place, so hand out a snapshot
+        return self.state.copy()
 
     def set_vector(self, vector: np.ndarray):
         if vector.shape != (2**self.num_qubits,):
             raise ValueError(f"Vector shape mismatch. Expected {2**self.num_qubits}, got {vector.shape[0]}")
-        self.state = sparse.csr_matrix(vector.reshape(1, -1))
+        # Own C-contiguous copy: the per-qubit reshapes below are views and
+        # gates write through them, which must not reach the caller's array
+        self.state = np.array(vector, dtype=np.complex128, order="C")
 
     def normalize(self):
-        norm = np.linalg.norm(self.state.data)
-        self.state.data /= norm
+        self.state /= np.linalg.norm(self.state)
 
     def apply_operator(self, operator: sparse.csr_matrix):
-        self.state = operator.dot(self.state.T).T
+        # Sparse matrix times dense vector runs as a single csr_matvec
+        self.state = operator @ self.state
         self.normalize()
 
+    def _qubit_view(self, qubit: int) -> np.ndarray:
+        # (2**qubit, 2, rest) view whose middle axis is `qubit`; qubit 0 is the most significant bit
+        return self.state.reshape(1 << qubit, 2, -1)
+
+    def apply_x(self, qubit: int):
+        psi = self._qubit_view(qubit)
+        flipped = psi[:, 0].copy()
+        psi[:, 0] = psi[:, 1]
+        psi[:, 1] = flipped
+
+    def apply_y(self, qubit: int):
+        psi = self._qubit_view(qubit)
+        flipped = psi[:, 0].copy()
+        psi[:, 0] = -1j * psi[:, 1]
+        psi[:, 1] = 1j * flipped
+
+    def apply_z(self, qubit: int):
+        self._qubit_view(qubit)[:, 1] *= -1
+
     def partial_trace(self, keep_qubits: List[int]) -> 'QuantumState':
         trace_out_qubits = list(set(range(self.num_qubits)) - set(keep_qubits))
-        reduced_density_matrix = partial_trace(self.state.toarray().reshape(-1, 1), trace_out_qubits)
+        reduced_density_matrix = partial_trace(self.state.reshape(-1, 1), trace_out_qubits)
         reduced_state = QuantumState(len(keep_qubits))
         reduced_state.set_vector(reduced_density_matrix.flatten())
         return reduced_state
 
 class QuantumGate:
-    def __init__(self, matrix: np.ndarray):
-        self.matrix = sparse.csr_matrix(matrix)
+    def __init__(self, matrix: Union[np.ndarray, sparse.spmatrix]):
+        # Gates are tiny (2x2 / 4x4); keep them dense and build CSR only on request
+        if sparse.issparse(matrix):
+            matrix = matrix.toarray()
+        self.dense = np.asarray(matrix, dtype=np.complex128)
+        self._sparse = None
+
+    @property
+    def matrix(self) -> sparse.csr_matrix:
+        if self._sparse is None:
+            self._sparse = sparse.csr_matrix(self.dense)
+        return self._sparse
 
     @staticmethod
     def create_controlled(gate: 'QuantumGate') -> 'QuantumGate':
-        controlled_matrix = sparse.eye(gate.matrix.shape[0] * 2, dtype=np.complex128)
-        controlled_matrix[gate.matrix.shape[0]:, gate.matrix.shape[0]:] = gate.matrix
+        d = gate.dense.shape[0]
+        controlled_matrix = np.eye(d * 2, dtype=np.complex128)
+        controlled_matrix[d:, d:] = gate.dense
         return QuantumGate(controlled_matrix)
 
 class QuantumRegister:
@@ -69,28 +158,39 @@ class QuantumRegister:
         if isinstance(target_qubits, int):
             target_qubits = [target_qubits]
         
-        # Construct the full gate operation
-        full_gate = sparse.eye(1, dtype=np.complex128)
-        for i in range(self.state.num_qubits):
-            if i in target_qubits:
-                full_gate = sparse.kron(full_gate, gate.matrix)
-            else:
-                full_gate = sparse.kron(full_gate, sparse.eye(2))
+        n = self.state.num_qubits
+        k = len(target_qubits)
+        matrix = gate.dense
+        if NUMBA_AVAILABLE and k == 1:
+            (u00, u01), (u10, u11) = matrix
+            apply_1q(self.state.state, u00, u01, u10, u11, n - 1 - target_qubits[0])
+            return
+        if NUMBA_AVAILABLE and k == 2:
+            apply_2q(self.state.state, matrix, n - 1 - target_qubits[0], n - 1 - target_qubits[1])
+            return
         
-        # Apply the gate
-        self.state.apply_operator(full_gate)
+        # Contract the 2^k x 2^k gate with the target axes of the state tensor
+        # instead of materializing the full 2^n x 2^n Kronecker operator.
+        # Axis q is qubit q (qubit 0 is the most significant bit); for multi-qubit
+        # gates the first target is the most significant bit of the gate matrix.
+        psi = np.moveaxis(self.state.state.reshape((2,) * n), target_qubits, range(k))
+        shape = psi.shape
+        psi = (matrix @ psi.reshape(2**k, -1)).reshape(shape)
+        self.state.state = np.ascontiguousarray(np.moveaxis(psi, range(k), target_qubits)).reshape(-1)
 
     def measure(self, num_shots: int = 1) -> List[List[int]]:
-        probabilities = np.abs(self.state.get_vector())**2
-        results = []
-        for _ in range(num_shots):
-            result = np.random.choice(2**self.state.num_qubits, p=probabilities)
-            measured_state = [int(x) for x in f"{result:0{self.state.num_qubits}b}"]
-            results.append(measured_state)
-        return results
+        n = self.state.num_qubits
+        # Sample every shot at once by inverting the cumulative distribution
+        cdf = np.cumsum(np.abs(self.state.state)**2)
+        outcomes = np.searchsorted(cdf, np.random.random(num_shots) * cdf[-1], side='right')
+        outcomes = np.minimum(outcomes, cdf.size - 1)
+        # Basis index -> bits, qubit 0 first (most significant bit)
+        bits = (outcomes[:, None] >> np.arange(n - 1, -1, -1)) & 1
+        return bits.tolist()
 
     def get_expectation_value(self, observable: sparse.csr_matrix) -> float:
-        return np.real(self.state.state.dot(observable.dot(self.state.state.T.conj()))[0, 0])
+        psi = self.state.state
+        return np.real(np.vdot(psi, observable @ psi))
 
 class QuantumCircuit:
     def __init__(self, num_qubits: int):
@@ -112,25 +212,45 @@ class QuantumCircuit:
             raise ValueError(f"Unknown gate: {gate_name}")
         self.register.apply_gate(self.gates[gate_name], target)
 
+    # exp(-i*theta/2*P) = cos(theta/2)*I - i*sin(theta/2)*P for any Pauli P
+
+    @staticmethod
+    def rx_matrix(theta: float) -> np.ndarray:
+        c, s = math.cos(theta / 2), math.sin(theta / 2)
+        return np.array([[c, -1j * s], [-1j * s, c]])
+
+    @staticmethod
+    def ry_matrix(theta: float) -> np.ndarray:
+        c, s = math.cos(theta / 2), math.sin(theta / 2)
+        return np.array([[c, -s], [s, c]], dtype=np.complex128)
+
+    @staticmethod
+    def rz_matrix(theta: float) -> np.ndarray:
+        phase = cmath.exp(-0.5j * theta)
+        return np.array([[phase, 0], [0, phase.conjugate()]])
+
+    @staticmethod
+    def rx_batch(thetas: np.ndarray) -> np.ndarray:
+        """RX matrices for an array of angles, shape (N, 2, 2)."""
+        half = np.asarray(thetas, dtype=np.float64) / 2
+        c, s = np.cos(half), -1j * np.sin(half)
+        return np.stack((np.stack((c, s), -1), np.stack((s, c), -1)), -2)
+
     def rx(self, theta: float, target: int):
-        rx_matrix = expm(-1j * theta / 2 * np.array([[0, 1], [1, 0]]))
-        rx_gate = QuantumGate(rx_matrix)
-        self.register.apply_gate(rx_gate, target)
+        self.register.apply_gate(QuantumGate(self.rx_matrix(theta)), target)
 
     def ry(self, theta: float, target: int):
-        ry_matrix = expm(-1j * theta / 2 * np.array([[0, -1j], [1j, 0]]))
-        ry_gate = QuantumGate(ry_matrix)
-        self.register.apply_gate(ry_gate, target)
+        self.register.apply_gate(QuantumGate(self.ry_matrix(theta)), target)
 
     def rz(self, theta: float, target: int):
-        rz_matrix = expm(-1j * theta / 2 * np.array([[1, 0], [0, -1]]))
-        rz_gate = QuantumGate(rz_matrix)
-        self.register.apply_gate(rz_gate, target)
+        self.register.apply_gate(QuantumGate(self.rz_matrix(theta)), target)
 
     def measure(self, num_shots: int = 1) -> List[List[int]]:
         return self.register.measure(num_shots)
 
-    def to_qiskit_circuit(self) -> QiskitQuantumCircuit:
+    def to_qiskit_circuit(self) -> 'QiskitQuantumCircuit':
+        # Imported here so the simulator itself loads without qiskit
+        from qiskit import QuantumCircuit as QiskitQuantumCircuit
         qiskit_circuit = QiskitQuantumCircuit(self.num_qubits)
         # Add conversion logic here to translate the circuit to Qiskit format
         # This requires iterating over self.gates and applying them to Qiskit circuit
@@ -170,32 +290,41 @@ def swap(circuit: QuantumCircuit, qubit1: int, qubit2: int):
     circuit.apply_gate('CNOT', [qubit2, qubit1])
     circuit.apply_gate('CNOT', [qubit1, qubit2])
 
-def simulate_shor_algorithm(n: int, a: int) -> int:
-    def quantum_period_finding(a: int, N: int) -> int:
-        # Simulate quantum period finding using classical computation
-        x, y = a, 1
-        r = 0
-        while y != 1:
-            x = (x * a) % N
-            y = (y * a) % N
-            r += 1
-        return r
+@lru_cache(maxsize=1024)
+def quantum_period_finding(a: int, N: int) -> int:
+    # Simulate quantum period finding using classical computation.
+    # The order of a mod N is below N, so give up (return 0) after N steps.
+    # Memoized so repeated factorizations of the same N skip known bases.
+    y = a % N
+    r = 1
+    while y != 1:
+        if r >= N:
+            return 0
+        y = (y * a) % N
+        r += 1
+    return r
 
+def simulate_shor_algorithm(n: int, a: int) -> int:
     if n % 2 == 0:
         return 2
-    
-    r = quantum_period_finding(a, n)
-    
-    if r % 2 != 0:
-        return simulate_shor_algorithm(n, a + 1)
-    
-    factor = np.gcd(a**(r//2) - 1, n)
-    if factor == 1 or factor == n:
-        return simulate_shor_algorithm(n, a + 1)
-    
-    return factor
+
+    # Try successive bases iteratively instead of recursing on failure
+    while a < n:
+        common = math.gcd(a, n)
+        if common != 1:
+            return common
+
+        r = quantum_period_finding(a, n)
+        if r and r % 2 == 0:
+            factor = math.gcd(pow(a, r // 2, n) - 1, n)
+            if factor != 1 and factor != n:
+                return factor
+        a += 1
+
+    raise ValueError(f"No nontrivial factor of {n} found")
 
 def visualize_state(state: np.ndarray):
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 5))
     plt.bar(range(len(state)), np.abs(state)**2)
     plt.title("Quantum State Probabilities")
@@ -203,10 +332,50 @@ def visualize_state(state: np.ndarray):
     plt.ylabel("Probability")
     plt.show()
 
+# Figure reused across visualize_bloch_sphere calls: (figure, arrow lines)
+_bloch_figure = None
+
+def bloch_vectors(state: np.ndarray) -> np.ndarray:
+    """Single-qubit Bloch vectors of a pure state, shape (n, 3), qubit 0 first."""
+    n = int(np.log2(len(state)))
+    psi = np.asarray(state, dtype=np.complex128).reshape([2] * n)
+    vectors = np.empty((n, 3))
+    for q in range(n):
+        # Qubit 0 is the least significant bit, i.e. the last tensor axis
+        m = np.moveaxis(psi, n - 1 - q, 0).reshape(2, -1)
+        rho = m @ m.conj().T
+        vectors[q] = (2 * rho[0, 1].real, -2 * rho[0, 1].imag, (rho[0, 0] - rho[1, 1]).real)
+    return vectors
+
 def visualize_bloch_sphere(state: np.ndarray):
-    qiskit_state = Statevector(state)
-    plot_bloch_multivector(qiskit_state)
-    plt.show()
+    global _bloch_figure
+    import matplotlib.pyplot as plt
+    vectors = bloch_vectors(state)
+    n = len(vectors)
+
+    if _bloch_figure is None or len(_bloch_figure[1]) != n or not plt.fignum_exists(_bloch_figure[0].number):
+        plt.ion()
+        fig = plt.figure(figsize=(3 * n, 3))
+        u, v = np.mgrid[0:2 * np.pi:24j, 0:np.pi:12j]
+        arrows = []
+        for q in range(n):
+            ax = fig.add_subplot(1, n, q + 1, projection='3d')
+            ax.plot_wireframe(np.cos(u) * np.sin(v), np.sin(u) * np.sin(v), np.cos(v),
+                              color='lightgray', linewidth=0.5)
+            ax.set_xlim(-1, 1)
+            ax.set_ylim(-1, 1)
+            ax.set_zlim(-1, 1)
+            ax.set_axis_off()
+            ax.set_title(f"qubit {q}")
+            arrows.append(ax.plot([0, 0], [0, 0], [0, 1], color='tab:red', linewidth=2)[0])
+        _bloch_figure = (fig, arrows)
+
+    # Only the arrows change between calls
+    fig, arrows = _bloch_figure
+    for line, (x, y, z) in zip(arrows, vectors):
+        line.set_data_3d([0, x], [0, y], [0, z])
+    fig.canvas.draw_idle()
+    fig.canvas.flush_events()
 
 def partial_trace(rho, trace_out_qubits):
     # Perform partial trace operation
@@ -215,42 +384,91 @@ def partial_trace(rho, trace_out_qubits):
     dims = [2] * n_qubits
     return np.einsum('ijkk->ij', rho.reshape(dims * 2)).reshape(2**len(keep_qubits), 2**len(keep_qubits))
 
+PAULI_LABELS = ('X', 'Y', 'Z')
+
 class QuantumErrorModel:
-    def __init__(self, error_rate: float):
+    def __init__(self, error_rate: float, seed: Optional[int] = None):
         self.error_rate = error_rate
+        # Counter-based generator: one instance, vectorized draws, reproducible with a seed
+        self._rng = np.random.Generator(np.random.Philox(seed))
 
     def apply_noise(self, state: QuantumState):
-        # Apply depolarizing noise
-        for i in range(state.num_qubits):
-            if np.random.random() < self.error_rate:
-                random_gate_name = np.random.choice(['X', 'Y', 'Z'])
-                random_gate = QuantumGate(np.array([[0, 1], [1, 0]]) if random_gate_name == 'X' else
-                                          np.array([[0, -1j], [1j, 0]]) if random_gate_name == 'Y' else
-                                          np.array([[1, 0], [0, -1]]))
-                state.apply_operator(random_gate.matrix)
+        # Apply depolarizing noise: one draw for every qubit, then a Pauli choice only for the hits
+        n = state.num_qubits
+        hits = np.flatnonzero(self._rng.random(n) < self.error_rate)
+        choices = self._rng.integers(0, 3, size=hits.size)
+        for qubit, choice in zip(hits, choices):
+            # Paulis permute / phase amplitudes in place; no operator is built
+            getattr(state, f'apply_{PAULI_LABELS[choice].lower()}')(int(qubit))
+
+    def apply_noise_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Apply independent depolarizing noise to every shot of a (num_shots, 2**n)
+        array of state vectors in place, one vectorized pass per qubit.
+        """
+        if not states.flags.c_contiguous:
+            # reshape would silently copy and the noise would never reach the caller
+            raise ValueError("apply_noise_batch needs a C-contiguous states array")
+        num_shots, dim = states.shape
+        n = dim.bit_length() - 1
+        hits = self._rng.random((num_shots, n)) < self.error_rate
+        choices = self._rng.integers(0, 3, size=(num_shots, n))
+        for qubit in range(n):
+            # (shots, 2**qubit, 2, rest) view; axis 2 is this qubit (most significant first)
+            psi = states.reshape(num_shots, 1 << qubit, 2, -1)
+            hit = hits[:, qubit]
+            x_shots = hit & (choices[:, qubit] == 0)
+            y_shots = hit & (choices[:, qubit] == 1)
+            z_shots = hit & (choices[:, qubit] == 2)
+            if x_shots.any():
+                psi[x_shots] = psi[x_shots][:, :, ::-1]
+            if y_shots.any():
+                sub = psi[y_shots]
+                psi[y_shots] = np.stack((-1j * sub[:, :, 1], 1j * sub[:, :, 0]), axis=2)
+            if z_shots.any():
+                psi[z_shots, :, 1] *= -1
+        return states
 
 class QuantumOptimizer:
-    def __init__(self, cost_function: Callable[[List[float]], float], num_params: int):
+    def __init__(self, cost_function: Callable[[np.ndarray], Union[float, np.ndarray]], num_params: int,
+                 vectorized: bool = False, epsilon: float = 1e-6, parameter_shift: bool = False,
+                 processes: Optional[int] = None):
+        # vectorized=True means cost_function maps a (batch, num_params) array to (batch,) costs.
+        # parameter_shift=True uses the exact shift rule for Pauli-rotation parameters:
+        # df/dtheta = (f(theta + pi/2) - f(theta - pi/2)) / 2.
+        # processes > 0 evaluates a scalar (picklable) cost_function in a process pool.
         self.cost_function = cost_function
         self.num_params = num_params
-
-    def optimize(self, initial_params: List[float], iterations: int = 100) -> List[float]:
-        params = initial_params
-        for _ in range(iterations):
-            gradient = self._compute_gradient(params)
-            params = [p - 0.01 * g for p, g in zip(params, gradient)]
+        self.vectorized = vectorized
+        self.epsilon = epsilon
+        self.parameter_shift = parameter_shift
+        self.processes = processes
+        shift = np.pi / 2 if parameter_shift else epsilon
+        self._denominator = 2.0 if parameter_shift else 2 * epsilon
+        self._perturbations = shift * np.eye(num_params)
+
+    def optimize(self, initial_params: Union[List[float], np.ndarray], iterations: int = 100) -> np.ndarray:
+        params = np.array(initial_params, dtype=np.float64)
+        pool = Pool(self.processes) if self.processes and not self.vectorized else None
+        try:
+            for _ in range(iterations):
+                params -= 0.01 * self._compute_gradient(params, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
         return params
 
-    def _compute_gradient(self, params: List[float]) -> List[float]:
-        epsilon = 1e-6
-        gradient = []
-        for i in range(self.num_params):
-            params_plus = params.copy()
-            params_plus[i] += epsilon
-            params_minus = params.copy()
-            params_minus[i] -= epsilon
-            gradient.append((self.cost_function(params_plus) - self.cost_function(params_minus)) / (2 * epsilon))
-        return gradient
+    def _compute_gradient(self, params: np.ndarray, pool: Optional[Pool] = None) -> np.ndarray:
+        # Rows of the stack are params shifted by +/- epsilon (or pi/2) along each axis
+        stacked = np.concatenate((params + self._perturbations, params - self._perturbations))
+        if self.vectorized:
+            costs = np.asarray(self.cost_function(stacked), dtype=np.float64)
+        elif pool is not None:
+            costs = np.array(pool.map(self.cost_function, stacked), dtype=np.float64)
+        else:
+            costs = np.array([self.cost_function(p) for p in stacked], dtype=np.float64)
+        return (costs[:self.num_params] - costs[self.num_params:]) / self._denominator
 
 class QuantumCircuitOptimizer:
     @staticmethod
@@ -287,11 +505,13 @@ def quantum_phase_estimation(unitary_circuit: QuantumCircuit, target_qubit: int,
         qpe_circuit.apply_gate('H', i)
     
     # Apply controlled unitary operations
+    # This is a simplified version: U is X, so controlled-U is the CNOT gate, and should be
+    # replaced with the actual controlled-unitary. U^(2^i) is formed once by repeated
+    # squaring and applied as a single controlled gate instead of 2^i separate passes.
+    u = qpe_circuit.gates['X'].dense
     for i in range(precision_qubits):
-        for _ in range(2**i):
-            # Apply controlled-U operation
-            # This is a simplified version and should be replaced with the actual controlled-unitary
-            qpe_circuit.apply_gate('CNOT', [i, target_qubit])
+        u_pow = QuantumGate(np.linalg.matrix_power(u, 2**i))
+        qpe_circuit.register.apply_gate(QuantumGate.create_controlled(u_pow), [i, target_qubit])
     
     # Apply inverse QFT to precision qubits
     quantum_fourier_transform(qpe_circuit, 0, precision_qubits - 1)
@@ -314,7 +534,7 @@ class QuantumMemory:
             capacity (int): Maximum number of QuantumState objects to store.
         """
         self.capacity = capacity
-        self.memory = []
+        self.memory = deque(maxlen=capacity)
 
     def store(self, state: QuantumState):
         """
@@ -323,9 +543,9 @@ class QuantumMemory:
         Args:
             state (QuantumState): The quantum state to store.
         """
-        if len(self.memory) >= self.capacity:
-            removed_state = self.memory.pop(0)
-            logger.info(f"Memory capacity exceeded. Removed oldest state: {removed_state}")
+        if self.memory and len(self.memory) >= self.capacity:
+            logger.info(f"Memory capacity exceeded. Removed oldest state: {self.memory[0]}")
+        # A full deque drops its oldest entry on append
         self.memory.append(state)
         logger.info(f"Stored state: {state}")
 